@@ -2,34 +2,53 @@
 Application factory for the Teacher Dashboard application.
 Creates and configures the Flask application.
 """
-from flask import Flask, jsonify
+from flask import Flask, jsonify, g, request
 from flask_smorest import Api
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_migrate import Migrate
 from flask_cors import CORS
+from flask_caching import Cache
+from sqlalchemy import event
+from app.utils.json_provider import ORJSONProvider
+import importlib
+import logging
 import os
 
 # Initialize extensions
 db = SQLAlchemy()
 migrate = Migrate()
 login_manager = LoginManager()
+cache = Cache()
 
 def create_app(config_object="app.config.DevConfig"):
     """Create and configure the Flask application."""
     app = Flask(__name__)
     app.config.from_object(config_object)
+    app.json = ORJSONProvider(app)
+    
+    if app.config.get('LOG_LEVEL') is not None:
+        logging.basicConfig(level=app.config['LOG_LEVEL'])
     
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
     login_manager.init_app(app)
+    cache.init_app(app)
     
     # Configure CORS - allow requests from frontend
     CORS(app, supports_credentials=True, resources={
         r"/api/*": {"origins": app.config.get('CORS_ORIGINS', '*')}
     })
     
+    # Answer CORS preflight requests before any view or auth decorator runs;
+    # Flask-CORS still attaches its headers in after_request
+    @app.before_request
+    def skip_preflight():
+        """Return an empty response for OPTIONS requests on known routes."""
+        if request.method == 'OPTIONS' and request.url_rule is not None:
+            return '', 204
+    
     # Setup API with Flask-Smorest
     api = Api(app)
     
@@ -38,8 +57,14 @@ def create_app(config_object="app.config.DevConfig"):
     
     @login_manager.user_loader
     def load_user(user_id):
-        """Load user by ID for Flask-Login."""
-        return User.query.get(int(user_id))
+        """Load user by ID for Flask-Login, reusing the instance within a request."""
+        cache_key = f'_user_{int(user_id)}'
+        user = g.get(cache_key)
+        if user is None:
+            # Session.get checks the identity map before querying
+            user = db.session.get(User, int(user_id))
+            setattr(g, cache_key, user)
+        return user
     
     # Handle unauthorized access
     @login_manager.unauthorized_handler
@@ -54,30 +79,70 @@ def create_app(config_object="app.config.DevConfig"):
     register_error_handlers(app)
     
     # Register blueprints
-    register_blueprints(api)
+    register_blueprints(api, app.config.get('ENABLED_BLUEPRINTS'))
     
-    # Create database tables if not exists (for development)
-    with app.app_context():
-        db.create_all()
+    # Register CLI commands
+    register_commands(app)
+    
+    # Tune SQLite connections before the first one is opened
+    register_sqlite_pragmas(app)
+    
+    # Create database tables if not exists (development and testing only)
+    if app.config.get('AUTO_CREATE_TABLES', False):
+        with app.app_context():
+            db.create_all()
     
     return app
 
-def register_blueprints(api):
-    """Register all API blueprints with the application."""
-    from app.api.auth import auth_blp
-    
-    # Register blueprints with API
-    api.register_blueprint(auth_blp)
-    
-    # Import and register class and course blueprints
-    # Will be implemented in subsequent steps
-    from app.api.classes import classes_blp
-    from app.api.courses import courses_blp
-    from app.api.students import students_blp
-    
-    api.register_blueprint(classes_blp)
-    api.register_blueprint(courses_blp)
-    api.register_blueprint(students_blp)
+# Blueprint name -> (module path, attribute), imported only when registered
+BLUEPRINTS = {
+    'auth': ('app.api.auth', 'auth_blp'),
+    'classes': ('app.api.classes', 'classes_blp'),
+    'courses': ('app.api.courses', 'courses_blp'),
+    'students': ('app.api.students', 'students_blp'),
+}
+
+def _lazy(modpath, attr):
+    """Import a module by dotted path and return one of its attributes."""
+    return getattr(importlib.import_module(modpath), attr)
+
+def register_blueprints(api, enabled=None):
+    """
+    Register API blueprints with the application.
+    
+    Only the blueprints named in `enabled` (all of them when None) are
+    imported, so their models and schemas are not loaded otherwise.
+    """
+    for name, (modpath, attr) in BLUEPRINTS.items():
+        if enabled is None or name in enabled:
+            api.register_blueprint(_lazy(modpath, attr))
+
+def register_commands(app):
+    """Register CLI commands with the application."""
+    @app.cli.command('init-db')
+    def init_db():
+        """Create all database tables that do not exist yet."""
+        db.create_all()
+        print("Database tables created")
+
+def register_sqlite_pragmas(app):
+    """Issue the configured SQLITE_PRAGMAS on each new connection to a SQLite database."""
+    pragmas = app.config.get('SQLITE_PRAGMAS')
+    if not pragmas:
+        return
+    
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name != 'sqlite':
+        return
+    
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Apply the pragmas to a freshly opened SQLite connection."""
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
 
 def register_error_handlers(app):
     """Register error handlers for the application."""
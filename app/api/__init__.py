@@ -1,9 +1,5 @@
 """
 API package initialization.
-Import all blueprints to make them available when importing from app.api.
+Blueprints are imported lazily by app.register_blueprints, so nothing is
+imported here; import them from their own modules (e.g. app.api.auth).
 """
-
-from app.api.auth import auth_blp
-from app.api.classes import classes_blp
-from app.api.courses import courses_blp
-from app.api.students import students_blp
\ No newline at end of file
@@ -5,9 +5,12 @@ Provides endpoints for login, logout, and checking login status.
 from flask import Blueprint, request, jsonify, session
 from flask_smorest import Blueprint, abort
 from flask_login import login_user, logout_user, current_user, login_required
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from app import db
 from app.models.user import User
 from app.schemas import LoginSchema, UserSchema, UserCreateSchema
+from app.utils.security import hash_password
 
 auth_blp = Blueprint(
     'auth', 
@@ -30,7 +33,8 @@ def login(login_data):
     password = login_data.get('password')
     remember = login_data.get('remember', False)
     
-    user = User.query.filter_by(email=email).first()
+    # Emails match case-insensitively (served by the unique lower(email) index)
+    user = User.query.filter(func.lower(User.email) == email.lower()).first()
     
     if not user or not user.check_password(password):
         abort(401, message="Invalid email or password")
@@ -96,11 +100,6 @@ def register(user_data):
     Returns:
         The created user object
     """
-    # Check if the user already exists
-    existing_user = User.query.filter_by(email=user_data['email']).first()
-    if existing_user:
-        abort(409, message="A user with this email already exists")
-    
     # Create the new user
     user = User(
         email=user_data['email'],
@@ -112,8 +111,13 @@ def register(user_data):
     # Add to database
     db.session.add(user)
     
+    # The unique indexes on email and lower(email) reject duplicate registrations,
+    # including ones that differ only in case
     try:
         db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        abort(409, message="A user with this email already exists")
     except Exception as e:
         db.session.rollback()
         abort(500, message=f"Error creating user: {str(e)}")
@@ -156,50 +160,28 @@ def seed_database():
             "message": "Database already has users"
         }), 409
     
-    # Create sample users
-    teacher1 = User(
-        email="teacher@example.com",
-        name="Jane Teacher",
-        role="teacher"
-    )
-    teacher1.set_password("password")
-    
-    teacher2 = User(
-        email="teacher2@example.com",
-        name="Mike Johnson",
-        role="teacher"
-    )
-    teacher2.set_password("password")
-    
-    student1 = User(
-        email="student@example.com",
-        name="John Student",
-        role="student"
-    )
-    student1.set_password("password")
-    
-    # Add more sample students
-    students = [
-        User(email="student1@example.com", name="Emily Parker", role="student"),
-        User(email="student2@example.com", name="Michael Brown", role="student"),
-        User(email="student3@example.com", name="Sophia Wilson", role="student"),
-        User(email="student4@example.com", name="Daniel Lee", role="student"),
-        User(email="student5@example.com", name="Olivia Martinez", role="student"),
-        User(email="student6@example.com", name="James Taylor", role="student")
+    # Every sample user shares the same password, so hash it only once
+    password_hash = hash_password("password")
+    
+    # Sample users, inserted in a single multi-row INSERT
+    users = [
+        {"email": "teacher@example.com", "name": "Jane Teacher", "role": "teacher"},
+        {"email": "teacher2@example.com", "name": "Mike Johnson", "role": "teacher"},
+        {"email": "student@example.com", "name": "John Student", "role": "student"},
+        {"email": "student1@example.com", "name": "Emily Parker", "role": "student"},
+        {"email": "student2@example.com", "name": "Michael Brown", "role": "student"},
+        {"email": "student3@example.com", "name": "Sophia Wilson", "role": "student"},
+        {"email": "student4@example.com", "name": "Daniel Lee", "role": "student"},
+        {"email": "student5@example.com", "name": "Olivia Martinez", "role": "student"},
+        {"email": "student6@example.com", "name": "James Taylor", "role": "student"}
     ]
     
-    for student in students:
-        student.set_password("password")
-    
-    # Add all users to the database
-    db.session.add(teacher1)
-    db.session.add(teacher2)
-    db.session.add(student1)
-    
-    for student in students:
-        db.session.add(student)
+    for user in users:
+        user["password_hash"] = password_hash
     
     try:
+        # Add all users to the database
+        db.session.execute(User.__table__.insert(), users)
         db.session.commit()
     except Exception as e:
         db.session.rollback()
@@ -212,7 +194,7 @@ def seed_database():
         "status": "success",
         "message": "Database seeded successfully",
         "data": {
-            "teachers": 2,
-            "students": 7
+            "teachers": sum(1 for user in users if user["role"] == "teacher"),
+            "students": sum(1 for user in users if user["role"] == "student")
         }
     })
\ No newline at end of file
@@ -2,19 +2,28 @@
 Classes API for the Teacher Dashboard application.
 Provides endpoints for managing classes, their students, and assigned courses.
 """
-from flask import Blueprint, request, jsonify, g
+from flask import jsonify, g
 from flask_smorest import Blueprint, abort
 from flask_login import login_required, current_user
-from app import db
-from app.models.class_model import Class
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
+from app import db, cache
+from app.models.class_model import Class, class_list_load_options
 from app.models.course import Course
 from app.models.user import User
-from app.models.associations import ClassCourse, ClassStudent
+from app.models.associations import ClassStudent, insert_ignore_duplicates
+from app.schemas.user import dump_user
 from app.schemas.class_schema import (
     ClassSchema, ClassCreateSchema, ClassUpdateSchema,
-    ClassCourseOperationSchema, ClassStudentOperationSchema
+    ClassCourseOperationSchema, ClassStudentOperationSchema, BulkStudentIdsSchema,
+    dump_classes
+)
+from app.utils.security import teacher_required, teacher_owner_required
+from app.utils.cache import (
+    class_students_key, class_courses_key,
+    invalidate_class_students, invalidate_class_courses, invalidate_student_classes,
+    invalidate_class_course_lists
 )
-from app.utils.security import teacher_required, resource_owner_required
 
 classes_blp = Blueprint(
     'classes', 
@@ -23,6 +32,31 @@ classes_blp = Blueprint(
     description='Class management operations'
 )
 
+# Schema instances are reused across requests rather than rebuilt per call
+_class_schema = ClassSchema()
+
+# Eager-load a class's enrolled students / assigned courses alongside the class
+_load_students = selectinload(Class.enrolled_students)
+_load_courses = selectinload(Class.courses)
+
+
+def _is_enrolled(class_id, student_id):
+    """Check enrollment with a SELECT EXISTS instead of loading the row."""
+    return db.session.query(
+        ClassStudent.query.filter_by(class_id=class_id, student_id=student_id).exists()
+    ).scalar()
+
+
+def _check_class_access(class_id, teacher_id):
+    """Abort with 403 unless the current user teaches or is enrolled in the class."""
+    if current_user.is_teacher and teacher_id != current_user.id:
+        abort(403, message="You can only view your own classes")
+    
+    if current_user.is_student:
+        # Check if student is enrolled in this class
+        if not _is_enrolled(class_id, current_user.id):
+            abort(403, message="You are not enrolled in this class")
+
 
 @classes_blp.route('/', methods=['GET'])
 @login_required
@@ -38,15 +72,16 @@ def get_classes():
     """
     if current_user.is_teacher:
         # Get classes taught by the teacher
-        classes = Class.query.filter_by(teacher_id=current_user.id).all()
+        classes = Class.query.options(*class_list_load_options()) \
+            .filter_by(teacher_id=current_user.id).all()
     else:
         # Get classes the student is enrolled in
-        enrolled_class_ids = [cs.class_id for cs in current_user.enrolled_classes]
-        classes = Class.query.filter(Class.id.in_(enrolled_class_ids)).all() if enrolled_class_ids else []
+        classes = Class.query.options(*class_list_load_options()).join(
+            ClassStudent, ClassStudent.class_id == Class.id
+        ).filter(ClassStudent.student_id == current_user.id).all()
     
     # Serialize the classes
-    schema = ClassSchema(many=True)
-    result = schema.dump(classes)
+    result = dump_classes(classes)
     
     return jsonify({
         "status": "success",
@@ -69,28 +104,32 @@ def get_class_by_id(class_id):
     Returns:
         Class details including enrolled students and assigned courses
     """
-    class_item = Class.query.get_or_404(class_id)
+    # Only the columns the student and course summaries render are loaded
+    class_item = Class.query.options(
+        joinedload(Class.teacher),
+        selectinload(Class.enrolled_students).load_only(User.id, User.name, User.role),
+        selectinload(Class.courses).load_only(
+            Course.id, Course.title, Course.description, Course.date,
+            Course.total_marks, Course.difficulty_rating, Course.teacher_id
+        )
+    ).filter_by(id=class_id).first_or_404()
     
     # Check access permissions
-    if current_user.is_teacher and class_item.teacher_id != current_user.id:
-        abort(403, message="You can only view your own classes")
-    
-    if current_user.is_student:
-        # Check if student is enrolled in this class
-        is_enrolled = ClassStudent.query.filter_by(
-            class_id=class_id, student_id=current_user.id
-        ).first() is not None
-        
-        if not is_enrolled:
-            abort(403, message="You are not enrolled in this class")
-    
-    # Serialize the class with related entities
-    schema = ClassSchema()
-    result = schema.dump(class_item)
-    
-    # Add students and courses
-    result['students'] = [s.to_dict(include_email=False) for s in class_item.enrolled_students]
-    result['courses'] = [c.to_dict() for c in class_item.courses]
+    _check_class_access(class_id, class_item.teacher_id)
+    
+    # Serialize the class with related entities as plain dicts rather than
+    # walking the nested schemas once per student and course
+    result = {
+        'id': class_item.id,
+        'name': class_item.name,
+        'section_number': class_item.section_number,
+        'teacher_id': class_item.teacher_id,
+        'created_at': class_item.created_at.isoformat() if class_item.created_at is not None else None,
+        'updated_at': class_item.updated_at.isoformat() if class_item.updated_at is not None else None,
+        'teacher': dump_user(class_item.teacher) if class_item.teacher is not None else None,
+        'students': [s.to_dict(include_email=False) for s in class_item.enrolled_students],
+        'courses': [c.to_dict() for c in class_item.courses]
+    }
     
     return jsonify({
         "status": "success",
@@ -101,20 +140,14 @@ def get_class_by_id(class_id):
 @classes_blp.route('/', methods=['POST'])
 @login_required
 @teacher_required
-def create_class():
+@classes_blp.arguments(ClassCreateSchema)
+def create_class(data):
     """
     Create a new class (teacher only).
     
     Returns:
         The created class object
     """
-    # Validate request data
-    schema = ClassCreateSchema()
-    try:
-        data = schema.load(request.json)
-    except Exception as e:
-        abort(400, message=str(e))
-    
     # Create the class with the current teacher as owner
     new_class = Class(
         name=data['name'],
@@ -134,34 +167,28 @@ def create_class():
     return jsonify({
         "status": "success",
         "message": "Class created successfully",
-        "data": ClassSchema().dump(new_class)
+        "data": _class_schema.dump(new_class)
     }), 201
 
 
 @classes_blp.route('/<int:class_id>', methods=['PUT'])
 @login_required
-@teacher_required
-@resource_owner_required(Class, owner_field='teacher_id')
-def update_class(class_id):
+@teacher_owner_required(Class, id_param='class_id')
+@classes_blp.arguments(ClassUpdateSchema)
+def update_class(data, class_id):
     """
     Update an existing class (teacher only, must be owner).
     
     Args:
+        data: Validated fields to update
         class_id: ID of the class to update
         
     Returns:
         The updated class object
     """
-    # Class is retrieved by the resource_owner_required decorator and stored in g.resource
+    # Class is retrieved by the teacher_owner_required decorator and stored in g.resource
     class_item = g.resource
     
-    # Validate request data
-    schema = ClassUpdateSchema()
-    try:
-        data = schema.load(request.json)
-    except Exception as e:
-        abort(400, message=str(e))
-    
     # Update class fields
     if 'name' in data:
         class_item.name = data['name']
@@ -178,14 +205,13 @@ def update_class(class_id):
     return jsonify({
         "status": "success",
         "message": "Class updated successfully",
-        "data": ClassSchema().dump(class_item)
+        "data": _class_schema.dump(class_item)
     })
 
 
 @classes_blp.route('/<int:class_id>', methods=['DELETE'])
 @login_required
-@teacher_required
-@resource_owner_required(Class, owner_field='teacher_id')
+@teacher_owner_required(Class, id_param='class_id')
 def delete_class(class_id):
     """
     Delete a class (teacher only, must be owner).
@@ -196,9 +222,14 @@ def delete_class(class_id):
     Returns:
         Success message
     """
-    # Class is retrieved by the resource_owner_required decorator and stored in g.resource
+    # Class is retrieved by the teacher_owner_required decorator and stored in g.resource
     class_item = g.resource
     
+    # The enrollments go with the class, so collect whose caches to drop first
+    student_ids = db.session.execute(
+        select(ClassStudent.student_id).where(ClassStudent.class_id == class_id)
+    ).scalars().all()
+    
     # Delete the class (cascade will handle association tables)
     db.session.delete(class_item)
     
@@ -208,6 +239,11 @@ def delete_class(class_id):
         db.session.rollback()
         abort(500, message=f"Error deleting class: {str(e)}")
     
+    invalidate_class_students(class_id)
+    invalidate_class_courses(class_id)
+    # Also drops the students' course listings, which included this class's courses
+    invalidate_student_classes(*student_ids)
+    
     return jsonify({
         "status": "success",
         "message": f"Class '{class_item.name}' deleted successfully"
@@ -226,27 +262,21 @@ def get_class_students(class_id):
     Returns:
         List of students enrolled in the class
     """
-    class_item = Class.query.get_or_404(class_id)
-    
-    # Check access permissions
-    if current_user.is_teacher and class_item.teacher_id != current_user.id:
-        abort(403, message="You can only view your own classes")
-    
-    if current_user.is_student:
-        # Check if student is enrolled in this class
-        is_enrolled = ClassStudent.query.filter_by(
-            class_id=class_id, student_id=current_user.id
-        ).first() is not None
-        
-        if not is_enrolled:
-            abort(403, message="You are not enrolled in this class")
+    # The roster is cached per class; access is still checked on every request
+    cached = cache.get(class_students_key(class_id))
+    if cached is None:
+        class_item = Class.query.options(_load_students).filter_by(id=class_id).first_or_404()
+        cached = {
+            'teacher_id': class_item.teacher_id,
+            'data': [s.to_dict(include_email=False) for s in class_item.enrolled_students]
+        }
+        cache.set(class_students_key(class_id), cached)
     
-    # Get students enrolled in the class
-    students = class_item.enrolled_students
+    _check_class_access(class_id, cached['teacher_id'])
     
     return jsonify({
         "status": "success",
-        "data": [s.to_dict(include_email=False) for s in students]
+        "data": cached['data']
     })
 
 
@@ -262,57 +292,45 @@ def get_class_courses(class_id):
     Returns:
         List of courses assigned to the class
     """
-    class_item = Class.query.get_or_404(class_id)
-    
-    # Check access permissions
-    if current_user.is_teacher and class_item.teacher_id != current_user.id:
-        abort(403, message="You can only view your own classes")
-    
-    if current_user.is_student:
-        # Check if student is enrolled in this class
-        is_enrolled = ClassStudent.query.filter_by(
-            class_id=class_id, student_id=current_user.id
-        ).first() is not None
-        
-        if not is_enrolled:
-            abort(403, message="You are not enrolled in this class")
+    # The course list is cached per class; access is still checked on every request
+    cached = cache.get(class_courses_key(class_id))
+    if cached is None:
+        class_item = Class.query.options(_load_courses).filter_by(id=class_id).first_or_404()
+        cached = {
+            'teacher_id': class_item.teacher_id,
+            'data': [c.to_dict() for c in class_item.courses]
+        }
+        cache.set(class_courses_key(class_id), cached)
     
-    # Get courses assigned to the class
-    courses = class_item.courses
+    _check_class_access(class_id, cached['teacher_id'])
     
     return jsonify({
         "status": "success",
-        "data": [c.to_dict() for c in courses]
+        "data": cached['data']
     })
 
 
 @classes_blp.route('/<int:class_id>/courses', methods=['POST'])
 @login_required
-@teacher_required
-@resource_owner_required(Class, owner_field='teacher_id')
-def add_course_to_class(class_id):
+@teacher_owner_required(Class, id_param='class_id')
+@classes_blp.arguments(ClassCourseOperationSchema)
+def add_course_to_class(data, class_id):
     """
     Add a course to a class (teacher only, must be class owner).
     
     Args:
+        data: Validated request body containing the course_id
         class_id: ID of the class
         
     Returns:
         Success message
     """
-    # Class is retrieved by the resource_owner_required decorator and stored in g.resource
+    # Class is retrieved by the teacher_owner_required decorator and stored in g.resource
     class_item = g.resource
     
-    # Validate request data
-    schema = ClassCourseOperationSchema()
-    try:
-        data = schema.load(request.json)
-    except Exception as e:
-        abort(400, message=str(e))
-    
     # Ensure course exists
     course_id = data['course_id']
-    course = Course.query.get(course_id)
+    course = db.session.get(Course, course_id)
     if not course:
         abort(404, message=f"Course with ID {course_id} not found")
     
@@ -331,6 +349,9 @@ def add_course_to_class(class_id):
         db.session.rollback()
         abort(500, message=f"Error adding course to class: {str(e)}")
     
+    invalidate_class_courses(class_id)
+    invalidate_class_course_lists(class_id)
+    
     return jsonify({
         "status": "success",
         "message": f"Course '{course.title}' added to class successfully"
@@ -339,8 +360,7 @@ def add_course_to_class(class_id):
 
 @classes_blp.route('/<int:class_id>/courses/<int:course_id>', methods=['DELETE'])
 @login_required
-@teacher_required
-@resource_owner_required(Class, owner_field='teacher_id')
+@teacher_owner_required(Class, id_param='class_id')
 def remove_course_from_class(class_id, course_id):
     """
     Remove a course from a class (teacher only, must be class owner).
@@ -352,11 +372,11 @@ def remove_course_from_class(class_id, course_id):
     Returns:
         Success message
     """
-    # Class is retrieved by the resource_owner_required decorator and stored in g.resource
+    # Class is retrieved by the teacher_owner_required decorator and stored in g.resource
     class_item = g.resource
     
     # Ensure course exists
-    course = Course.query.get(course_id)
+    course = db.session.get(Course, course_id)
     if not course:
         abort(404, message=f"Course with ID {course_id} not found")
     
@@ -375,6 +395,9 @@ def remove_course_from_class(class_id, course_id):
         db.session.rollback()
         abort(500, message=f"Error removing course from class: {str(e)}")
     
+    invalidate_class_courses(class_id)
+    invalidate_class_course_lists(class_id)
+    
     return jsonify({
         "status": "success",
         "message": f"Course '{course.title}' removed from class successfully"
@@ -383,41 +406,35 @@ def remove_course_from_class(class_id, course_id):
 
 @classes_blp.route('/<int:class_id>/students', methods=['POST'])
 @login_required
-@teacher_required
-@resource_owner_required(Class, owner_field='teacher_id')
-def add_student_to_class(class_id):
+@teacher_owner_required(Class, id_param='class_id')
+@classes_blp.arguments(ClassStudentOperationSchema)
+def add_student_to_class(data, class_id):
     """
     Add a student to a class (teacher only, must be class owner).
     
     Args:
+        data: Validated request body containing the student_id
         class_id: ID of the class
         
     Returns:
         Success message
     """
-    # Class is retrieved by the resource_owner_required decorator and stored in g.resource
+    # Class is retrieved by the teacher_owner_required decorator and stored in g.resource
     class_item = g.resource
     
-    # Validate request data
-    schema = ClassStudentOperationSchema()
-    try:
-        data = schema.load(request.json)
-    except Exception as e:
-        abort(400, message=str(e))
-    
-    # Ensure student exists and is a student
+    # Add the student to the class; existence and role are checked by the INSERT
     student_id = data['student_id']
-    student = User.query.get(student_id)
-    if not student:
-        abort(404, message=f"User with ID {student_id} not found")
-    
-    if student.role != 'student':
-        abort(400, message="Only students can be enrolled in classes")
-    
-    # Add the student to the class
     success = class_item.add_student(student_id)
     
     if not success:
+        # Work out why nothing was inserted; only this path needs the user row
+        student = db.session.get(User, student_id)
+        if not student:
+            abort(404, message=f"User with ID {student_id} not found")
+        
+        if student.role != 'student':
+            abort(400, message="Only students can be enrolled in classes")
+        
         return jsonify({
             "status": "error",
             "message": "Student is already enrolled in this class"
@@ -429,16 +446,18 @@ def add_student_to_class(class_id):
         db.session.rollback()
         abort(500, message=f"Error adding student to class: {str(e)}")
     
+    invalidate_class_students(class_id)
+    invalidate_student_classes(student_id)
+    
     return jsonify({
         "status": "success",
-        "message": f"Student '{student.name}' enrolled in class successfully"
+        "message": f"Student with ID {student_id} enrolled in class successfully"
     })
 
 
 @classes_blp.route('/<int:class_id>/students/<int:student_id>', methods=['DELETE'])
 @login_required
-@teacher_required
-@resource_owner_required(Class, owner_field='teacher_id')
+@teacher_owner_required(Class, id_param='class_id')
 def remove_student_from_class(class_id, student_id):
     """
     Remove a student from a class (teacher only, must be class owner).
@@ -450,11 +469,11 @@ def remove_student_from_class(class_id, student_id):
     Returns:
         Success message
     """
-    # Class is retrieved by the resource_owner_required decorator and stored in g.resource
+    # Class is retrieved by the teacher_owner_required decorator and stored in g.resource
     class_item = g.resource
     
     # Ensure student exists
-    student = User.query.get(student_id)
+    student = db.session.get(User, student_id)
     if not student:
         abort(404, message=f"User with ID {student_id} not found")
     
@@ -473,6 +492,9 @@ def remove_student_from_class(class_id, student_id):
         db.session.rollback()
         abort(500, message=f"Error removing student from class: {str(e)}")
     
+    invalidate_class_students(class_id)
+    invalidate_student_classes(student_id)
+    
     return jsonify({
         "status": "success",
         "message": f"Student '{student.name}' removed from class successfully"
@@ -481,13 +503,14 @@ def remove_student_from_class(class_id, student_id):
 
 @classes_blp.route('/<int:class_id>/students/bulk', methods=['POST'])
 @login_required
-@teacher_required
-@resource_owner_required(Class, owner_field='teacher_id')
-def bulk_add_students(class_id):
+@teacher_owner_required(Class, id_param='class_id')
+@classes_blp.arguments(BulkStudentIdsSchema)
+def bulk_add_students(data, class_id):
     """
     Add multiple students to a class in a single operation (teacher only, must be class owner).
     
     Args:
+        data: Validated request body containing the student_ids
         class_id: ID of the class
         
     Expected JSON body:
@@ -498,20 +521,11 @@ def bulk_add_students(class_id):
     Returns:
         Success message with details of added students
     """
-    # Class is retrieved by the resource_owner_required decorator and stored in g.resource
+    # Class is retrieved by the teacher_owner_required decorator and stored in g.resource
     class_item = g.resource
     
-    # Validate request data
-    if not request.is_json:
-        abort(400, message="Request must be JSON")
-    
-    data = request.get_json()
-    if not isinstance(data.get('student_ids', []), list):
-        abort(400, message="student_ids must be a list of integers")
-    
-    student_ids = data['student_ids']
-    if not student_ids:
-        abort(400, message="No student IDs provided")
+    # Each ID is reported once, however often it was sent
+    student_ids = list(dict.fromkeys(data['student_ids']))
     
     # Track results
     results = {
@@ -521,9 +535,13 @@ def bulk_add_students(class_id):
         'not_students': []
     }
     
+    # Fetch all requested users in one query
+    users = {u.id: u for u in User.query.filter(User.id.in_(student_ids)).all()}
+    
+    valid_ids = []
     for student_id in student_ids:
         # Ensure student exists and is a student
-        student = User.query.get(student_id)
+        student = users.get(student_id)
         if not student:
             results['not_found'].append(student_id)
             continue
@@ -532,8 +550,18 @@ def bulk_add_students(class_id):
             results['not_students'].append(student_id)
             continue
         
-        # Try to add the student
-        if class_item.add_student(student_id):
+        valid_ids.append(student_id)
+    
+    # Enroll every valid student in one INSERT; existing enrollments are skipped
+    added = insert_ignore_duplicates(
+        ClassStudent,
+        [{'class_id': class_id, 'student_id': sid} for sid in valid_ids],
+        ClassStudent.student_id
+    )
+    
+    for student_id in valid_ids:
+        student = users[student_id]
+        if student_id in added:
             results['success'].append({
                 'id': student_id,
                 'name': student.name
@@ -550,6 +578,9 @@ def bulk_add_students(class_id):
         db.session.rollback()
         abort(500, message=f"Error adding students to class: {str(e)}")
     
+    invalidate_class_students(class_id)
+    invalidate_student_classes(*[student['id'] for student in results['success']])
+    
     # Prepare response message
     message = []
     if results['success']:
@@ -570,13 +601,14 @@ def bulk_add_students(class_id):
 
 @classes_blp.route('/<int:class_id>/students/bulk', methods=['DELETE'])
 @login_required
-@teacher_required
-@resource_owner_required(Class, owner_field='teacher_id')
-def bulk_remove_students(class_id):
+@teacher_owner_required(Class, id_param='class_id')
+@classes_blp.arguments(BulkStudentIdsSchema)
+def bulk_remove_students(data, class_id):
     """
     Remove multiple students from a class in a single operation (teacher only, must be class owner).
     
     Args:
+        data: Validated request body containing the student_ids
         class_id: ID of the class
         
     Expected JSON body:
@@ -587,20 +619,11 @@ def bulk_remove_students(class_id):
     Returns:
         Success message with details of removed students
     """
-    # Class is retrieved by the resource_owner_required decorator and stored in g.resource
+    # Class is retrieved by the teacher_owner_required decorator and stored in g.resource
     class_item = g.resource
     
-    # Validate request data
-    if not request.is_json:
-        abort(400, message="Request must be JSON")
-    
-    data = request.get_json()
-    if not isinstance(data.get('student_ids', []), list):
-        abort(400, message="student_ids must be a list of integers")
-    
-    student_ids = data['student_ids']
-    if not student_ids:
-        abort(400, message="No student IDs provided")
+    # Each ID is reported once, however often it was sent
+    student_ids = list(dict.fromkeys(data['student_ids']))
     
     # Track results
     results = {
@@ -609,15 +632,25 @@ def bulk_remove_students(class_id):
         'not_found': []
     }
     
+    # Fetch all requested users and their existing enrollments in two queries
+    users = {u.id: u for u in User.query.filter(User.id.in_(student_ids)).all()}
+    enrolled_ids = {
+        cs.student_id for cs in ClassStudent.query.filter(
+            ClassStudent.class_id == class_id,
+            ClassStudent.student_id.in_(users.keys())
+        ).all()
+    }
+    
+    removed_ids = set()
     for student_id in student_ids:
         # Ensure student exists
-        student = User.query.get(student_id)
+        student = users.get(student_id)
         if not student:
             results['not_found'].append(student_id)
             continue
         
-        # Try to remove the student
-        if class_item.remove_student(student_id):
+        if student_id in enrolled_ids:
+            removed_ids.add(student_id)
             results['success'].append({
                 'id': student_id,
                 'name': student.name
@@ -628,12 +661,23 @@ def bulk_remove_students(class_id):
                 'name': student.name
             })
     
+    if removed_ids:
+        db.session.execute(
+            ClassStudent.__table__.delete().where(
+                ClassStudent.class_id == class_id,
+                ClassStudent.student_id.in_(removed_ids)
+            )
+        )
+    
     try:
         db.session.commit()
     except Exception as e:
         db.session.rollback()
         abort(500, message=f"Error removing students from class: {str(e)}")
     
+    invalidate_class_students(class_id)
+    invalidate_student_classes(*removed_ids)
+    
     # Prepare response message
     message = []
     if results['success']:
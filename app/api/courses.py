@@ -2,21 +2,29 @@
 Courses API for the Teacher Dashboard application.
 Provides endpoints for managing courses created by teachers.
 """
-from flask import Blueprint, request, jsonify, g
+from flask import current_app, request, jsonify, g
 from flask_smorest import Blueprint, abort
 from flask_login import login_required, current_user
-from sqlalchemy import func
-from app import db
-from app.models.course import Course
+from sqlalchemy import and_, select
+from sqlalchemy.orm import selectinload
+from app import db, cache
+from app.models.course import Course, COURSE_LIST_COLUMNS
 from app.models.class_model import Class
-from app.models.associations import ClassCourse
+from app.models.associations import ClassCourse, ClassStudent
 from app.schemas.course import (
     CourseSchema, 
     CourseRequestSchema, 
-    CourseFiltersSchema
+    CourseFiltersSchema,
+    dump_courses
+)
+from app.schemas.pagination import paginated_response
+from app.utils.cursor import keyset_page, cursor_pagination
+from app.utils.security import teacher_required, teacher_owner_required
+from app.utils.db import relax_commit_durability
+from app.utils.cache import (
+    course_list_key, invalidate_class_courses, invalidate_course_lists,
+    invalidate_class_course_lists, COURSE_LIST_CACHE_TIMEOUT
 )
-from app.schemas.pagination import PaginatedResponseSchema
-from app.utils.security import teacher_required, resource_owner_required
 
 courses_blp = Blueprint(
     'courses', 
@@ -25,6 +33,17 @@ courses_blp = Blueprint(
     description='Course management operations'
 )
 
+# Schema instances are reused across requests rather than rebuilt per call
+_course_schema = CourseSchema()
+_course_request_schema = CourseRequestSchema()
+_course_update_schema = CourseRequestSchema(partial=True)
+_course_filters_schema = CourseFiltersSchema()
+
+
+def _like_escape(value):
+    """Escape LIKE wildcards in user input so it is matched literally."""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
 
 @courses_blp.route('/', methods=['GET'])
 @login_required
@@ -36,21 +55,27 @@ def get_courses():
     For students: Returns courses they're enrolled in
     
     Query Parameters:
-    - page: Page number for pagination (default: 1)
+    - cursor: Cursor returned as next_cursor by the previous page (default: first page)
     - per_page: Number of items per page (default: 10, max: 100)
     - filters: Optional filtering parameters
     
     Returns:
-        Paginated list of courses
+        Cursor-paginated list of courses
     """
+    # Each page is cached per user and URL until the user's listings are invalidated;
+    # the encoded body is cached, so a hit is written out without re-serializing
+    cache_key = course_list_key(current_user.id)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return current_app.response_class(cached, mimetype=current_app.json.mimetype)
+    
     # Parse pagination parameters
-    page = request.args.get('page', 1, type=int)
-    per_page = min(request.args.get('per_page', 10, type=int), 100)
+    cursor = request.args.get('cursor')
+    per_page = max(min(request.args.get('per_page', 10, type=int), 100), 1)
     
     # Parse filters
-    filter_schema = CourseFiltersSchema()
     try:
-        filters = filter_schema.load(request.args) if request.args else {}
+        filters = _course_filters_schema.load(request.args) if request.args else {}
     except Exception as e:
         abort(400, message=str(e))
     
@@ -60,19 +85,17 @@ def get_courses():
         base_query = Course.query.filter_by(teacher_id=current_user.id)
     else:
         # For students, get courses from their enrolled classes
-        enrolled_class_ids = [cs.class_id for cs in current_user.enrolled_classes]
-        
-        # Subquery to get course IDs from enrolled classes
-        course_ids_subquery = db.session.query(
-            db.func.distinct(ClassCourse.course_id)
-        ).join(Class).filter(Class.id.in_(enrolled_class_ids)).subquery()
+        enrolled_class_ids = current_user.get_enrolled_class_ids()
         
-        base_query = Course.query.filter(Course.id.in_(course_ids_subquery))
+        # Courses assigned to any of those classes, each listed once
+        base_query = Course.query.join(
+            ClassCourse, ClassCourse.course_id == Course.id
+        ).filter(ClassCourse.class_id.in_(enrolled_class_ids)).distinct()
     
     # Apply filters
     if filters.get('title'):
         base_query = base_query.filter(
-            func.lower(Course.title).contains(func.lower(filters['title']))
+            Course.title.ilike(f"%{_like_escape(filters['title'])}%", escape='\\')
         )
     
     if filters.get('difficulty'):
@@ -84,31 +107,23 @@ def get_courses():
     if filters.get('dateTo'):
         base_query = base_query.filter(Course.date <= filters['dateTo'])
     
-    # Order by most recent courses first
-    base_query = base_query.order_by(Course.date.desc())
-    
-    # Paginate
-    paginated_courses = base_query.paginate(page=page, per_page=per_page)
+    # Most recent courses first; (date, id) keeps the order stable for the cursor
+    try:
+        courses, next_cursor = keyset_page(
+            base_query.with_entities(*COURSE_LIST_COLUMNS),
+            (Course.date, Course.id), cursor, per_page, descending=True
+        )
+    except ValueError as e:
+        abort(400, message=str(e))
     
     # Prepare response
-    schema = CourseSchema(many=True)
-    pagination_schema = PaginatedResponseSchema()
-    
-    return jsonify(pagination_schema.dump({
-        'items': schema.dump(paginated_courses.items),
-        'pagination': {
-            'page': paginated_courses.page,
-            'per_page': paginated_courses.per_page,
-            'total_pages': paginated_courses.pages,
-            'total_items': paginated_courses.total,
-            'has_next': paginated_courses.has_next,
-            'has_prev': paginated_courses.has_prev,
-            'next_url': (request.base_url + f'?page={paginated_courses.next_num}&per_page={per_page}') 
-                        if paginated_courses.has_next else None,
-            'prev_url': (request.base_url + f'?page={paginated_courses.prev_num}&per_page={per_page}') 
-                        if paginated_courses.has_prev else None
-        }
-    }))
+    result = paginated_response(
+        dump_courses(courses), cursor_pagination(per_page, cursor, next_cursor)
+    )
+    response = jsonify(result)
+    cache.set(cache_key, response.get_data(), timeout=COURSE_LIST_CACHE_TIMEOUT)
+    
+    return response
 
 
 @courses_blp.route('/<int:course_id>', methods=['GET'])
@@ -126,25 +141,34 @@ def get_course_by_id(course_id):
     Returns:
         Course details including assigned classes
     """
-    course = Course.query.get_or_404(course_id)
-    
-    # Authorization checks
+    # The authorization rule is part of the lookup, so a permitted request costs a
+    # single query; only a miss needs another one to tell 404 from 403
     if current_user.is_teacher:
         # Teacher can only view their own courses
-        if course.teacher_id != current_user.id:
-            abort(403, message="You can only view your own courses")
+        authorized = Course.teacher_id == current_user.id
+        denied = "You can only view your own courses"
     else:
         # Student can only view courses from their enrolled classes
-        enrolled_class_ids = [cs.class_id for cs in current_user.enrolled_classes]
-        
-        # Check if course is in any of the student's enrolled classes
-        assigned_class_ids = [c.id for c in course.assigned_classes]
-        if not set(enrolled_class_ids) & set(assigned_class_ids):
-            abort(403, message="You are not enrolled in a class with this course")
+        authorized = db.exists().where(and_(
+            ClassCourse.course_id == Course.id,
+            ClassStudent.class_id == ClassCourse.class_id,
+            ClassStudent.student_id == current_user.id
+        ))
+        denied = "You are not enrolled in a class with this course"
+    
+    # The assigned classes are rendered by id, name and section only
+    course = Course.query.options(
+        selectinload(Course.assigned_classes).load_only(
+            Class.id, Class.name, Class.section_number
+        )
+    ).filter(Course.id == course_id, authorized).first()
+    
+    if course is None:
+        db.get_or_404(Course, course_id)
+        abort(403, message=denied)
     
     # Serialize the course with related classes
-    schema = CourseSchema()
-    result = schema.dump(course)
+    result = _course_schema.dump(course)
     
     # Add assigned classes to the response
     result['assigned_classes'] = [
@@ -169,9 +193,8 @@ def create_course():
         The created course object
     """
     # Validate request data
-    schema = CourseRequestSchema()
     try:
-        data = schema.load(request.json)
+        data = _course_request_schema.load(request.json)
     except Exception as e:
         abort(400, message=str(e))
     
@@ -194,17 +217,18 @@ def create_course():
         db.session.rollback()
         abort(500, message=f"Error creating course: {str(e)}")
     
+    invalidate_course_lists(current_user.id)
+    
     return jsonify({
         "status": "success",
         "message": "Course created successfully",
-        "data": CourseSchema().dump(new_course)
+        "data": _course_schema.dump(new_course)
     }), 201
 
 
 @courses_blp.route('/<int:course_id>', methods=['PUT'])
 @login_required
-@teacher_required
-@resource_owner_required(Course, owner_field='teacher_id')
+@teacher_owner_required(Course, id_param='course_id')
 def update_course(course_id):
     """
     Update an existing course (teacher only, must be course owner).
@@ -215,13 +239,12 @@ def update_course(course_id):
     Returns:
         The updated course object
     """
-    # Course is retrieved by the resource_owner_required decorator and stored in g.resource
+    # Course is retrieved by the teacher_owner_required decorator and stored in g.resource
     course = g.resource
     
     # Validate request data
-    schema = CourseRequestSchema(partial=True)
     try:
-        data = schema.load(request.json)
+        data = _course_update_schema.load(request.json)
     except Exception as e:
         abort(400, message=str(e))
     
@@ -229,23 +252,33 @@ def update_course(course_id):
     for key, value in data.items():
         setattr(course, key, value)
     
+    # Course edits are low-stakes, so the commit need not wait for the disk flush
+    relax_commit_durability()
+    
     try:
         db.session.commit()
     except Exception as e:
         db.session.rollback()
         abort(500, message=f"Error updating course: {str(e)}")
     
+    # Classes (and their students) whose cached course lists include this course
+    class_ids = db.session.execute(
+        select(ClassCourse.class_id).where(ClassCourse.course_id == course.id)
+    ).scalars().all()
+    invalidate_class_courses(*class_ids)
+    invalidate_class_course_lists(*class_ids)
+    invalidate_course_lists(current_user.id)
+    
     return jsonify({
         "status": "success",
         "message": "Course updated successfully",
-        "data": CourseSchema().dump(course)
+        "data": _course_schema.dump(course)
     })
 
 
 @courses_blp.route('/<int:course_id>', methods=['DELETE'])
 @login_required
-@teacher_required
-@resource_owner_required(Course, owner_field='teacher_id')
+@teacher_owner_required(Course, id_param='course_id')
 def delete_course(course_id):
     """
     Delete a course (teacher only, must be course owner).
@@ -256,9 +289,17 @@ def delete_course(course_id):
     Returns:
         Success message
     """
-    # Course is retrieved by the resource_owner_required decorator and stored in g.resource
+    # Course is retrieved by the teacher_owner_required decorator and stored in g.resource
     course = g.resource
     
+    # Classes (and their students) whose cached course lists include this course
+    class_ids = db.session.execute(
+        select(ClassCourse.class_id).where(ClassCourse.course_id == course.id)
+    ).scalars().all()
+    student_ids = db.session.execute(
+        select(ClassStudent.student_id).where(ClassStudent.class_id.in_(class_ids)).distinct()
+    ).scalars().all()
+    
     # Delete the course (cascade will handle association tables)
     db.session.delete(course)
     
@@ -268,6 +309,9 @@ def delete_course(course_id):
         db.session.rollback()
         abort(500, message=f"Error deleting course: {str(e)}")
     
+    invalidate_class_courses(*class_ids)
+    invalidate_course_lists(current_user.id, *student_ids)
+    
     return jsonify({
         "status": "success",
         "message": f"Course '{course.title}' deleted successfully"
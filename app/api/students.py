@@ -2,21 +2,26 @@
 Students API for the Teacher Dashboard application.
 Provides endpoints for student-specific operations and views.
 """
-from flask import Blueprint, request, jsonify
+from flask import current_app, request, jsonify
 from flask_smorest import Blueprint, abort
 from flask_login import login_required, current_user
 from sqlalchemy import func
-from app import db
+from sqlalchemy.exc import IntegrityError
+from app import db, cache
 from app.models.user import User
-from app.models.course import Course
-from app.models.class_model import Class
-from app.models.associations import ClassStudent
-from app.schemas.user import UserSchema, UserUpdateSchema
-from app.schemas.course import CourseSchema
-from app.schemas.class_schema import ClassSchema
-from app.schemas.pagination import PaginatedResponseSchema
+from app.models.course import Course, COURSE_LIST_COLUMNS
+from app.models.class_model import Class, class_list_load_options
+from app.schemas.user import UserUpdateSchema, dump_user
+from app.schemas.course import dump_courses
+from app.schemas.class_schema import dump_classes
+from app.schemas.pagination import paginated_response
+from app.utils.cursor import keyset_page, cursor_pagination
 from app.models.associations import ClassCourse
-from app.utils.security import student_required, resource_owner_required
+from app.utils.security import student_required
+from app.utils.db import relax_commit_durability
+from app.utils.cache import (
+    course_list_key, invalidate_class_students, COURSE_LIST_CACHE_TIMEOUT
+)
 
 students_blp = Blueprint(
     'students', 
@@ -25,6 +30,9 @@ students_blp = Blueprint(
     description='Student-specific operations'
 )
 
+# Schema instances are reused across requests rather than rebuilt per call
+_user_update_schema = UserUpdateSchema()
+
 
 @students_blp.route('/courses', methods=['GET'])
 @login_required
@@ -34,60 +42,49 @@ def get_student_courses():
     Get all courses the logged-in student is enrolled in.
     
     Query Parameters:
-    - page: Page number for pagination (default: 1)
+    - cursor: Cursor returned as next_cursor by the previous page (default: first page)
     - per_page: Number of items per page (default: 10, max: 100)
     - filters: Optional filtering parameters
     
     Returns:
-        Paginated list of courses the student is enrolled in
+        Cursor-paginated list of courses the student is enrolled in
     """
-    # Ensure only students can access this endpoint
-    if not current_user.is_student:
-        abort(403, message="Only students can access this endpoint")
+    # Each page is cached per user and URL until the user's listings are invalidated;
+    # the encoded body is cached, so a hit is written out without re-serializing
+    cache_key = course_list_key(current_user.id)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return current_app.response_class(cached, mimetype=current_app.json.mimetype)
     
     # Parse pagination parameters
-    page = request.args.get('page', 1, type=int)
-    per_page = min(request.args.get('per_page', 10, type=int), 100)
+    cursor = request.args.get('cursor')
+    per_page = max(min(request.args.get('per_page', 10, type=int), 100), 1)
     
     # Get enrolled class IDs
-    enrolled_class_ids = [cs.class_id for cs in current_user.enrolled_classes]
-    
-    # Subquery to get unique course IDs from enrolled classes
-    course_ids_subquery = db.session.query(
-        func.distinct(ClassCourse.course_id)
-    ).join(Class).filter(Class.id.in_(enrolled_class_ids)).subquery()
-    
-    # Base query for courses
-    base_query = Course.query.filter(Course.id.in_(course_ids_subquery))
-    
-    # Optional: Apply additional filters if needed
-    # (You can expand this based on CourseFiltersSchema similar to courses API)
+    enrolled_class_ids = current_user.get_enrolled_class_ids()
     
-    # Order by most recent courses first
-    base_query = base_query.order_by(Course.date.desc())
+    # Base query for courses assigned to any of those classes, each listed once
+    base_query = Course.query.join(
+        ClassCourse, ClassCourse.course_id == Course.id
+    ).filter(ClassCourse.class_id.in_(enrolled_class_ids)).distinct()
     
-    # Paginate
-    paginated_courses = base_query.paginate(page=page, per_page=per_page)
+    # Most recent courses first; (date, id) keeps the order stable for the cursor
+    try:
+        courses, next_cursor = keyset_page(
+            base_query.with_entities(*COURSE_LIST_COLUMNS),
+            (Course.date, Course.id), cursor, per_page, descending=True
+        )
+    except ValueError as e:
+        abort(400, message=str(e))
     
     # Prepare response
-    schema = CourseSchema(many=True)
-    pagination_schema = PaginatedResponseSchema()
-    
-    return jsonify(pagination_schema.dump({
-        'items': schema.dump(paginated_courses.items),
-        'pagination': {
-            'page': paginated_courses.page,
-            'per_page': paginated_courses.per_page,
-            'total_pages': paginated_courses.pages,
-            'total_items': paginated_courses.total,
-            'has_next': paginated_courses.has_next,
-            'has_prev': paginated_courses.has_prev,
-            'next_url': (request.base_url + f'?page={paginated_courses.next_num}&per_page={per_page}') 
-                        if paginated_courses.has_next else None,
-            'prev_url': (request.base_url + f'?page={paginated_courses.prev_num}&per_page={per_page}') 
-                        if paginated_courses.has_prev else None
-        }
-    }))
+    result = paginated_response(
+        dump_courses(courses), cursor_pagination(per_page, cursor, next_cursor)
+    )
+    response = jsonify(result)
+    cache.set(cache_key, response.get_data(), timeout=COURSE_LIST_CACHE_TIMEOUT)
+    
+    return response
 
 
 @students_blp.route('/classes', methods=['GET'])
@@ -98,51 +95,33 @@ def get_student_classes():
     Get all classes the logged-in student is enrolled in.
     
     Query Parameters:
-    - page: Page number for pagination (default: 1)
+    - cursor: Cursor returned as next_cursor by the previous page (default: first page)
     - per_page: Number of items per page (default: 10, max: 100)
     
     Returns:
-        Paginated list of classes the student is enrolled in
+        Cursor-paginated list of classes the student is enrolled in
     """
-    # Ensure only students can access this endpoint
-    if not current_user.is_student:
-        abort(403, message="Only students can access this endpoint")
-    
     # Parse pagination parameters
-    page = request.args.get('page', 1, type=int)
-    per_page = min(request.args.get('per_page', 10, type=int), 100)
+    cursor = request.args.get('cursor')
+    per_page = max(min(request.args.get('per_page', 10, type=int), 100), 1)
     
     # Get enrolled class IDs
-    enrolled_class_ids = [cs.class_id for cs in current_user.enrolled_classes]
+    enrolled_class_ids = current_user.get_enrolled_class_ids()
     
     # Base query for classes
-    base_query = Class.query.filter(Class.id.in_(enrolled_class_ids))
+    base_query = Class.query.options(*class_list_load_options()) \
+        .filter(Class.id.in_(enrolled_class_ids))
     
-    # Order by class name
-    base_query = base_query.order_by(Class.name)
-    
-    # Paginate
-    paginated_classes = base_query.paginate(page=page, per_page=per_page)
+    # Order by class name; (name, id) keeps the order stable for the cursor
+    try:
+        classes, next_cursor = keyset_page(base_query, (Class.name, Class.id), cursor, per_page)
+    except ValueError as e:
+        abort(400, message=str(e))
     
     # Prepare response
-    schema = ClassSchema(many=True)
-    pagination_schema = PaginatedResponseSchema()
-    
-    return jsonify(pagination_schema.dump({
-        'items': schema.dump(paginated_classes.items),
-        'pagination': {
-            'page': paginated_classes.page,
-            'per_page': paginated_classes.per_page,
-            'total_pages': paginated_classes.pages,
-            'total_items': paginated_classes.total,
-            'has_next': paginated_classes.has_next,
-            'has_prev': paginated_classes.has_prev,
-            'next_url': (request.base_url + f'?page={paginated_classes.next_num}&per_page={per_page}') 
-                        if paginated_classes.has_next else None,
-            'prev_url': (request.base_url + f'?page={paginated_classes.prev_num}&per_page={per_page}') 
-                        if paginated_classes.has_prev else None
-        }
-    }))
+    return jsonify(paginated_response(
+        dump_classes(classes), cursor_pagination(per_page, cursor, next_cursor)
+    ))
 
 
 @students_blp.route('/profile', methods=['GET'])
@@ -155,26 +134,21 @@ def get_student_profile():
     Returns:
         Student profile information including enrolled classes and courses
     """
-    # Ensure only students can access this endpoint
-    if not current_user.is_student:
-        abort(403, message="Only students can access this endpoint")
-    
-    # Prepare student details
-    student_schema = UserSchema()
-    course_schema = CourseSchema(many=True)
-    class_schema = ClassSchema(many=True)
-    
-    # Get enrolled courses and classes
-    enrolled_courses = current_user.get_enrolled_courses()
-    enrolled_classes = [cs.class_ for cs in current_user.enrolled_classes]
+    # Load enrollments with everything the response renders in a fixed number of queries;
+    # the courses are then collected from the already loaded classes
+    enrolled_classes = [cs.class_ for cs in current_user.get_enrollments()]
+    enrolled_courses = sorted(
+        {course.id: course for c in enrolled_classes for course in c.courses}.values(),
+        key=lambda course: course.id
+    )
     
     # Prepare response
     return jsonify({
         "status": "success",
         "data": {
-            "profile": student_schema.dump(current_user),
-            "enrolled_courses": course_schema.dump(enrolled_courses),
-            "enrolled_classes": class_schema.dump(enrolled_classes)
+            "profile": dump_user(current_user),
+            "enrolled_courses": dump_courses(enrolled_courses),
+            "enrolled_classes": dump_classes(enrolled_classes)
         }
     })
 
@@ -190,9 +164,8 @@ def update_student_profile():
         Updated student profile information
     """
     # Validate request data
-    schema = UserUpdateSchema()
     try:
-        data = schema.load(request.json)
+        data = _user_update_schema.load(request.json)
     except Exception as e:
         abort(400, message=str(e))
     
@@ -207,9 +180,9 @@ def update_student_profile():
     
     # Update other profile fields
     if 'email' in data:
-        # Check if email is already in use
+        # Check if email is already in use, ignoring case like login does
         existing_user = User.query.filter(
-            User.email == data['email'], 
+            func.lower(User.email) == data['email'].lower(), 
             User.id != current_user.id
         ).first()
         
@@ -221,16 +194,27 @@ def update_student_profile():
     if 'name' in data:
         current_user.name = data['name']
     
+    # Name and email edits need not wait for the disk flush; password changes do
+    if 'new_password' not in data:
+        relax_commit_durability()
+    
     try:
         db.session.commit()
+    except IntegrityError:
+        # Another account took the email since the check above
+        db.session.rollback()
+        abort(409, message="Email is already in use")
     except Exception as e:
         db.session.rollback()
         abort(500, message=f"Error updating profile: {str(e)}")
     
+    # Class rosters show the student's name
+    if 'name' in data:
+        invalidate_class_students(*current_user.get_enrolled_class_ids())
+    
     # Prepare response
-    schema = UserSchema()
     return jsonify({
         "status": "success",
         "message": "Profile updated successfully",
-        "data": schema.dump(current_user)
+        "data": dump_user(current_user)
     })
\ No newline at end of file
@@ -1,13 +1,31 @@
 """
 Configuration settings for the Teacher Dashboard application.
 """
+import logging
 import os
 from datetime import timedelta
+from sqlalchemy.pool import StaticPool
 
 class Config:
     """Base configuration."""
     SECRET_KEY = os.environ.get('SECRET_KEY', '111')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Connection pool sizing; pre-ping and recycle drop stale connections
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
+    # Applied to every new SQLite connection (ignored for other databases); WAL lets
+    # readers run alongside a writer, the rest trades fsyncs and page reads for memory
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536,
+        "temp_store": "MEMORY",
+        "mmap_size": 268435456,
+    }
     API_TITLE = "Teacher Dashboard API"
     API_VERSION = "v1"
     OPENAPI_VERSION = "3.0.2"
@@ -20,8 +38,21 @@ class Config:
     SESSION_COOKIE_SECURE = True
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = "Lax"
+    # bcrypt cost factor for password hashes; each step doubles the hashing time
+    BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+    # Cache for class roster / course list responses; SimpleCache is per process,
+    # so only single-process setups should use it (ProdConfig defaults to Redis)
+    CACHE_TYPE = os.environ.get('CACHE_TYPE', 'SimpleCache')
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL')
+    CACHE_DEFAULT_TIMEOUT = 30
     # CORS settings
     CORS_SUPPORTS_CREDENTIALS = True
+    # Root logging level configured by create_app (None leaves logging untouched)
+    LOG_LEVEL = None
+    # Blueprint names to register (None registers all of them)
+    ENABLED_BLUEPRINTS = None
+    # Run db.create_all() in create_app; production relies on migrations / flask init-db
+    AUTO_CREATE_TABLES = False
 
 
 class DevConfig(Config):
@@ -29,6 +60,7 @@ class DevConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///teacher_dashboard_dev.db')
     SESSION_COOKIE_SECURE = False  # Allow non-HTTPS in development
+    AUTO_CREATE_TABLES = True
 
 
 class TestConfig(Config):
@@ -37,12 +69,26 @@ class TestConfig(Config):
     SECRET_KEY = 'test-secret-key'
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Share the single in-memory connection instead of pooling
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "poolclass": StaticPool,
+        "connect_args": {"check_same_thread": False},
+    }
+    # An in-memory database has nothing to make durable: skip journaling work and syncs
+    SQLITE_PRAGMAS = {
+        "journal_mode": "MEMORY",
+        "synchronous": "OFF",
+        "temp_store": "MEMORY",
+        "locking_mode": "EXCLUSIVE",
+    }
     SESSION_PROTECTION = 'strong'
     WTF_CSRF_ENABLED = False
     SESSION_COOKIE_SECURE = False
-    # In app/config.py, add to TestConfig:
-    import logging
-    logging.basicConfig(level=logging.DEBUG)
+    # bcrypt's minimum cost; tests need valid hashes, not brute-force resistance
+    BCRYPT_ROUNDS = 4
+    AUTO_CREATE_TABLES = True
+    # Applied by create_app, so importing this module has no side effects
+    LOG_LEVEL = logging.DEBUG
 
 
 class ProdConfig(Config):
@@ -53,3 +99,7 @@ class ProdConfig(Config):
     SECRET_KEY = os.environ.get('SECRET_KEY', '111')
     if not SECRET_KEY:
         raise ValueError("No SECRET_KEY set for production application")
+    # Writes invalidate cached enrollments and course listings; a shared cache
+    # makes that reach every worker instead of only the one handling the write
+    CACHE_TYPE = os.environ.get('CACHE_TYPE', 'RedisCache')
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
@@ -2,8 +2,40 @@
 Association models for the Teacher Dashboard application.
 Defines many-to-many relationships between classes, courses, and students.
 """
-from datetime import datetime
+from sqlalchemy.dialects import postgresql, sqlite
 from app import db
+from app.utils.db import utcnow
+
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING ... RETURNING
+_UPSERT_DIALECTS = {
+    'postgresql': postgresql,
+    'sqlite': sqlite,
+}
+
+
+def dialect_insert(model):
+    """Return an INSERT for `model` that supports on_conflict_do_nothing()."""
+    return _UPSERT_DIALECTS[db.session.get_bind().dialect.name].insert(model)
+
+
+def insert_ignore_duplicates(model, rows, returning):
+    """
+    Insert association rows in one statement, skipping rows that already exist.
+    
+    Args:
+        model: The association model to insert into
+        rows: List of dicts with the column values for each row
+        returning: Column whose values are returned for the inserted rows
+    
+    Returns:
+        Set of `returning` values for the rows that were actually inserted
+    """
+    if not rows:
+        return set()
+    
+    stmt = dialect_insert(model).values(rows).on_conflict_do_nothing().returning(returning)
+    return set(db.session.execute(stmt).scalars())
+
 
 class ClassCourse(db.Model):
     """
@@ -15,10 +47,14 @@ class ClassCourse(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     class_id = db.Column(db.Integer, db.ForeignKey('classes.id'), nullable=False)
     course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), nullable=False)
     
     # Add a unique constraint to prevent duplicates
-    __table_args__ = (db.UniqueConstraint('class_id', 'course_id', name='uq_class_course'),)
+    __table_args__ = (
+        db.UniqueConstraint('class_id', 'course_id', name='uq_class_course'),
+        # Lookups by course (e.g. "is this course in one of my classes?")
+        db.Index('ix_class_courses_course_id_class_id', 'course_id', 'class_id'),
+    )
     
     # Relationships
     class_ = db.relationship('Class', back_populates='course_associations')
@@ -42,10 +78,14 @@ class ClassStudent(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     class_id = db.Column(db.Integer, db.ForeignKey('classes.id'), nullable=False)
     student_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    enrolled_date = db.Column(db.DateTime, default=datetime.utcnow)
+    enrolled_date = db.Column(db.DateTime, server_default=utcnow(), nullable=False)
     
     # Add a unique constraint to prevent duplicates
-    __table_args__ = (db.UniqueConstraint('class_id', 'student_id', name='uq_class_student'),)
+    __table_args__ = (
+        db.UniqueConstraint('class_id', 'student_id', name='uq_class_student'),
+        # Lookups by student (e.g. "which classes am I enrolled in?")
+        db.Index('ix_class_students_student_id_class_id', 'student_id', 'class_id'),
+    )
     
     # Relationships
     class_ = db.relationship('Class', back_populates='students')
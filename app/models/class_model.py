@@ -2,8 +2,10 @@
 Class model for the Teacher Dashboard application.
 Represents school classes with enrolled students and assigned courses.
 """
-from datetime import datetime
+from sqlalchemy import delete, literal, select
+from sqlalchemy.orm import raiseload, selectinload
 from app import db
+from app.utils.db import utcnow
 
 class Class(db.Model):
     """
@@ -16,88 +18,93 @@ class Class(db.Model):
     name = db.Column(db.String(100), nullable=False)
     section_number = db.Column(db.String(20), nullable=False)
     teacher_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), nullable=False)
+    updated_at = db.Column(db.DateTime, server_default=utcnow(), onupdate=utcnow(), nullable=False)
+    
+    # Composite index backing the keyset pagination sort order
+    __table_args__ = (db.Index('ix_classes_name_id', 'name', 'id'),)
     
     # Relationships
     teacher = db.relationship('User', back_populates='teaching_classes')
-    students = db.relationship('ClassStudent', back_populates='class_')
+    students = db.relationship('ClassStudent', back_populates='class_', cascade='all, delete-orphan')
     course_associations = db.relationship('ClassCourse', back_populates='class_', cascade='all, delete-orphan')
     
+    # Read-only shortcuts through the association tables; paths that render them
+    # eager-load them with selectinload (see class_list_load_options)
+    courses = db.relationship(
+        'Course', secondary='class_courses', viewonly=True, order_by='Course.id'
+    )
+    enrolled_students = db.relationship(
+        'User', secondary='class_students', viewonly=True, order_by='User.id'
+    )
+    
     def __init__(self, name, section_number, teacher_id):
         self.name = name
         self.section_number = section_number
         self.teacher_id = teacher_id
     
-    @property
-    def courses(self):
-        """Get all courses assigned to this class."""
-        from app.models.course import Course
-        course_ids = [cc.course_id for cc in self.course_associations]
-        return Course.query.filter(Course.id.in_(course_ids)).all() if course_ids else []
-    
-    @property
-    def enrolled_students(self):
-        """Get all students enrolled in this class."""
-        from app.models.user import User
-        student_ids = [cs.student_id for cs in self.students]
-        return User.query.filter(User.id.in_(student_ids)).all() if student_ids else []
-    
     def add_course(self, course_id):
         """Add a course to this class."""
-        from app.models.associations import ClassCourse
-        
-        # Check if course is already assigned
-        existing = ClassCourse.query.filter_by(
-            class_id=self.id, course_id=course_id
-        ).first()
+        from app.models.associations import ClassCourse, insert_ignore_duplicates
         
-        if not existing:
-            association = ClassCourse(class_id=self.id, course_id=course_id)
-            db.session.add(association)
-            return True
-        return False
+        # A course that is already assigned is skipped by the unique constraint
+        added = insert_ignore_duplicates(
+            ClassCourse,
+            [{'class_id': self.id, 'course_id': course_id}],
+            ClassCourse.course_id
+        )
+        return bool(added)
     
     def remove_course(self, course_id):
-        """Remove a course from this class."""
-        from app.models.associations import ClassCourse
+        """
+        Remove a course from this class.
         
-        association = ClassCourse.query.filter_by(
-            class_id=self.id, course_id=course_id
-        ).first()
+        Returns False if there was nothing to remove; a single DELETE both
+        checks for and removes the association.
+        """
+        from app.models.associations import ClassCourse
         
-        if association:
-            db.session.delete(association)
-            return True
-        return False
+        result = db.session.execute(
+            delete(ClassCourse).where(
+                ClassCourse.class_id == self.id, ClassCourse.course_id == course_id
+            )
+        )
+        return result.rowcount > 0
     
     def add_student(self, student_id):
-        """Enroll a student in this class."""
-        from app.models.associations import ClassStudent
+        """
+        Enroll a student in this class.
+        
+        Returns False if the user does not exist, is not a student, or is
+        already enrolled; the checks run inside the INSERT ... SELECT itself.
+        """
+        from app.models.associations import ClassStudent, dialect_insert
+        from app.models.user import User
         
-        # Check if student is already enrolled
-        existing = ClassStudent.query.filter_by(
-            class_id=self.id, student_id=student_id
-        ).first()
+        eligible = select(literal(self.id), User.id).where(
+            User.id == student_id, User.role == 'student'
+        )
+        stmt = dialect_insert(ClassStudent).from_select(
+            ['class_id', 'student_id'], eligible
+        ).on_conflict_do_nothing().returning(ClassStudent.student_id)
         
-        if not existing:
-            association = ClassStudent(class_id=self.id, student_id=student_id)
-            db.session.add(association)
-            return True
-        return False
+        return db.session.execute(stmt).first() is not None
     
     def remove_student(self, student_id):
-        """Remove a student from this class."""
-        from app.models.associations import ClassStudent
+        """
+        Remove a student from this class.
         
-        association = ClassStudent.query.filter_by(
-            class_id=self.id, student_id=student_id
-        ).first()
+        Returns False if there was nothing to remove; a single DELETE both
+        checks for and removes the association.
+        """
+        from app.models.associations import ClassStudent
         
-        if association:
-            db.session.delete(association)
-            return True
-        return False
+        result = db.session.execute(
+            delete(ClassStudent).where(
+                ClassStudent.class_id == self.id, ClassStudent.student_id == student_id
+            )
+        )
+        return result.rowcount > 0
     
     def to_dict(self, include_relationships=False):
         """Convert class object to dictionary for API responses."""
@@ -116,4 +123,17 @@ class Class(db.Model):
         return data
     
     def __repr__(self):
-        return f'<Class {self.id}: {self.name} (Section {self.section_number})>'
\ No newline at end of file
+        return f'<Class {self.id}: {self.name} (Section {self.section_number})>'
+
+
+def class_list_load_options():
+    """
+    Loader options for class listings: eager-load every relationship the class
+    dump renders, and raise on any other lazy load instead of issuing SQL per row.
+    """
+    return (
+        selectinload(Class.teacher),
+        selectinload(Class.students),
+        selectinload(Class.courses),
+        raiseload('*'),
+    )
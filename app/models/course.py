@@ -2,8 +2,11 @@
 Course model for the Teacher Dashboard application.
 Represents courses that can be assigned to classes.
 """
-from datetime import datetime
 from app import db
+from app.utils.db import utcnow
+
+# Allowed difficulty ratings, enforced by the database as well
+DIFFICULTY_RATINGS = ('easy', 'medium', 'hard', 'advanced')
 
 class Course(db.Model):
     """
@@ -17,15 +20,32 @@ class Course(db.Model):
     description = db.Column(db.Text, nullable=False)
     date = db.Column(db.Date, nullable=False)
     total_marks = db.Column(db.Integer, nullable=False)
-    difficulty_rating = db.Column(db.String(20), nullable=False)
+    # Native enum on PostgreSQL; elsewhere a short string guarded by a CHECK constraint
+    difficulty_rating = db.Column(
+        db.Enum(*DIFFICULTY_RATINGS, name='difficulty_rating', create_constraint=True),
+        nullable=False
+    )
     teacher_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), nullable=False)
+    updated_at = db.Column(db.DateTime, server_default=utcnow(), onupdate=utcnow(), nullable=False)
+    
+    # Composite indexes backing the keyset pagination sort order, overall and
+    # within a teacher's own courses, plus the difficulty filter
+    __table_args__ = (
+        db.Index('ix_courses_date_id', 'date', 'id'),
+        db.Index('ix_courses_teacher_id_date_id', 'teacher_id', 'date', 'id'),
+        db.Index('ix_courses_difficulty_rating', 'difficulty_rating'),
+    )
     
     # Relationships
     teacher = db.relationship('User', back_populates='created_courses')
     class_associations = db.relationship('ClassCourse', back_populates='course', cascade='all, delete-orphan')
     
+    # Read-only shortcut to the classes this course is assigned to
+    assigned_classes = db.relationship(
+        'Class', secondary='class_courses', viewonly=True, order_by='Class.id'
+    )
+    
     def __init__(self, title, description, date, total_marks, difficulty_rating, teacher_id):
         self.title = title
         self.description = description
@@ -34,17 +54,9 @@ class Course(db.Model):
         self.difficulty_rating = difficulty_rating
         self.teacher_id = teacher_id
     
-    @property
-    def assigned_classes(self):
-        """Get all classes this course is assigned to."""
-        from app.models.class_model import Class
-        class_ids = [cc.class_id for cc in self.class_associations]
-        return Class.query.filter(Class.id.in_(class_ids)).all() if class_ids else []
-    
     def is_valid_difficulty(self):
         """Validate that the difficulty rating is one of the allowed values."""
-        valid_ratings = ['easy', 'medium', 'hard', 'advanced']
-        return self.difficulty_rating in valid_ratings
+        return self.difficulty_rating in DIFFICULTY_RATINGS
     
     def to_dict(self):
         """Convert course object to dictionary for API responses."""
@@ -59,4 +71,19 @@ class Course(db.Model):
         }
     
     def __repr__(self):
-        return f'<Course {self.id}: {self.title}>'
\ No newline at end of file
+        return f'<Course {self.id}: {self.title}>'
+
+
+# Columns rendered in course listings; list endpoints fetch these as plain rows
+# with with_entities() so no Course instances are hydrated or tracked
+COURSE_LIST_COLUMNS = (
+    Course.id,
+    Course.title,
+    Course.description,
+    Course.date,
+    Course.total_marks,
+    Course.difficulty_rating,
+    Course.teacher_id,
+    Course.created_at,
+    Course.updated_at
+)
@@ -3,9 +3,14 @@ User model for the Teacher Dashboard application.
 Defines teacher and student user types with appropriate relationships.
 """
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import datetime
-from app import db
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
+from app import db, cache
+from app.utils.db import utcnow
+from app.utils.security import hash_password, verify_password
+
+# Allowed user roles, enforced by the database as well
+USER_ROLES = ('teacher', 'student')
 
 class User(db.Model, UserMixin):
     """
@@ -18,16 +23,31 @@ class User(db.Model, UserMixin):
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
     password_hash = db.Column(db.String(128), nullable=False)
     name = db.Column(db.String(100), nullable=False)
-    role = db.Column(db.String(20), nullable=False, default='student')
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Native enum on PostgreSQL; elsewhere a short string guarded by a CHECK constraint
+    role = db.Column(
+        db.Enum(*USER_ROLES, name='user_role', create_constraint=True),
+        nullable=False, default='student'
+    )
+    created_at = db.Column(db.DateTime, server_default=utcnow(), nullable=False)
+    updated_at = db.Column(db.DateTime, server_default=utcnow(), onupdate=utcnow(), nullable=False)
+    
+    __table_args__ = (
+        # Role-filtered lookups and listings, in id order
+        db.Index('ix_users_role_id', 'role', 'id'),
+        # Case-insensitive email lookups at login; also keeps two accounts from
+        # differing only in the case of their email
+        db.Index('ix_users_email_lower', db.func.lower(email), unique=True),
+    )
+    
+    # Collections load on first access (once per session) and can be eager-loaded
+    # with selectinload() where needed; a user load alone never queries them
     
     # Relations for teachers
-    teaching_classes = db.relationship('Class', back_populates='teacher', lazy='dynamic')
-    created_courses = db.relationship('Course', back_populates='teacher', lazy='dynamic')
+    teaching_classes = db.relationship('Class', back_populates='teacher')
+    created_courses = db.relationship('Course', back_populates='teacher')
     
     # Relations for students
-    enrolled_classes = db.relationship('ClassStudent', back_populates='student', lazy='dynamic')
+    enrolled_classes = db.relationship('ClassStudent', back_populates='student')
     
     def __init__(self, email, name, role, password=None):
         self.email = email
@@ -38,12 +58,14 @@ class User(db.Model, UserMixin):
     
     def set_password(self, password):
         """Hash and set the user's password."""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
         """Verify the user's password."""
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
     
+    # Role checks run on every authorized request; they only read the role column,
+    # which is loaded with the user, so they never hit the database
     @property
     def is_teacher(self):
         """Check if the user is a teacher."""
@@ -54,24 +76,52 @@ class User(db.Model, UserMixin):
         """Check if the user is a student."""
         return self.role == 'student'
     
+    def get_enrolled_class_ids(self):
+        """
+        Get the IDs of the classes the student is enrolled in, without loading the rows.
+        The list is cached per student until their enrollments change.
+        """
+        from app.models.associations import ClassStudent
+        from app.utils.cache import student_classes_key, ENROLLMENT_CACHE_TIMEOUT
+        
+        key = student_classes_key(self.id)
+        class_ids = cache.get(key)
+        if class_ids is None:
+            class_ids = db.session.execute(
+                select(ClassStudent.class_id).where(ClassStudent.student_id == self.id)
+            ).scalars().all()
+            cache.set(key, class_ids, timeout=ENROLLMENT_CACHE_TIMEOUT)
+        return class_ids
+    
+    def get_enrollments(self):
+        """
+        Get the student's ClassStudent rows with their classes and class teachers loaded
+        in the same query; each class's courses and student links are selectin-loaded.
+        """
+        from app.models.associations import ClassStudent
+        from app.models.class_model import Class
+        
+        return ClassStudent.query.options(
+            joinedload(ClassStudent.class_).options(
+                joinedload(Class.teacher),
+                selectinload(Class.students),
+                selectinload(Class.courses)
+            )
+        ).filter_by(student_id=self.id).all()
+    
     def get_enrolled_courses(self):
-        """Get all courses that a student is enrolled in through their classes."""
+        """Get all courses that a student is enrolled in through their classes, in one query."""
         if not self.is_student:
             return []
-            
-        # Collect all classes the student is enrolled in
-        enrolled_class_ids = [cs.class_id for cs in self.enrolled_classes]
-        
-        # Get all courses associated with these classes
-        from app.models.associations import ClassCourse
         
-        course_ids = db.session.query(ClassCourse.course_id) \
-            .filter(ClassCourse.class_id.in_(enrolled_class_ids)) \
-            .distinct().all()
-            
+        from app.models.associations import ClassCourse, ClassStudent
         from app.models.course import Course
         
-        return Course.query.filter(Course.id.in_([cid[0] for cid in course_ids])).all()
+        return Course.query \
+            .join(ClassCourse, ClassCourse.course_id == Course.id) \
+            .join(ClassStudent, ClassStudent.class_id == ClassCourse.class_id) \
+            .filter(ClassStudent.student_id == self.id) \
+            .distinct().order_by(Course.id).all()
     
     def to_dict(self, include_email=True):
         """Convert user object to dictionary for API responses."""
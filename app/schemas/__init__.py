@@ -3,7 +3,7 @@ Schemas package initialization.
 Import all schemas to make them available when importing from app.schemas.
 """
 
-from app.schemas.user import UserSchema, LoginSchema, UserCreateSchema, UserUpdateSchema
-from app.schemas.class_schema import ClassSchema, ClassCreateSchema, ClassUpdateSchema, ClassCourseOperationSchema, ClassStudentOperationSchema
-from app.schemas.course import CourseSchema, CourseRequestSchema
-from app.schemas.pagination import PaginationSchema, PaginatedResponseSchema
+from app.schemas.user import UserSchema, LoginSchema, UserCreateSchema, UserUpdateSchema, dump_user
+from app.schemas.class_schema import ClassSchema, ClassCreateSchema, ClassUpdateSchema, ClassCourseOperationSchema, ClassStudentOperationSchema, BulkStudentIdsSchema, dump_classes
+from app.schemas.course import CourseSchema, CourseRequestSchema, dump_courses
+from app.schemas.pagination import PaginationSchema, PaginatedResponseSchema, paginated_response
@@ -2,8 +2,8 @@
 Class related schemas for the Teacher Dashboard application.
 """
 from marshmallow import Schema, fields, validate, validates, ValidationError
-from app.schemas.user import UserSchema
-from app.schemas.course import CourseSchema
+from app.schemas.user import UserSchema, dump_user
+from app.schemas.course import CourseSchema, dump_courses
 
 class ClassCreateSchema(Schema):
     """Schema for class creation requests."""
@@ -29,6 +29,11 @@ class ClassStudentOperationSchema(Schema):
     student_id = fields.Int(required=True)
 
 
+class BulkStudentIdsSchema(Schema):
+    """Schema for adding/removing several students to/from a class at once."""
+    student_ids = fields.List(fields.Int(), required=True, validate=validate.Length(min=1))
+
+
 class ClassSchema(Schema):
     """Schema for class serialization."""
     id = fields.Int(dump_only=True)
@@ -46,11 +51,34 @@ class ClassSchema(Schema):
     @validates('name')
     def validate_name(self, value):
         """Validate class name."""
-        if not value.strip():
+        if not value or value.isspace():
             raise ValidationError('Class name cannot be empty.')
     
     @validates('section_number')
     def validate_section(self, value):
         """Validate section number."""
-        if not value.strip():
-            raise ValidationError('Section number cannot be empty.')
\ No newline at end of file
+        if not value or value.isspace():
+            raise ValidationError('Section number cannot be empty.')
+
+
+def dump_classes(classes):
+    """
+    Serialize classes to the same dictionaries as ClassSchema(many=True).dump,
+    reading the columns and loaded relationships directly instead of going
+    through marshmallow's per-field dispatch.
+    """
+    return [
+        {
+            'id': class_item.id,
+            'name': class_item.name,
+            'section_number': class_item.section_number,
+            'teacher_id': class_item.teacher_id,
+            'created_at': class_item.created_at.isoformat() if class_item.created_at is not None else None,
+            'updated_at': class_item.updated_at.isoformat() if class_item.updated_at is not None else None,
+            'teacher': dump_user(class_item.teacher) if class_item.teacher is not None else None,
+            # ClassSchema renders the enrollment links through UserSchema, so only their id appears
+            'students': [{'id': link.id} for link in class_item.students],
+            'courses': dump_courses(class_item.courses)
+        }
+        for class_item in classes
+    ]
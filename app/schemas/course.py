@@ -1,9 +1,10 @@
 """
 Course related schemas for the Teacher Dashboard application.
 """
-from marshmallow import Schema, fields, validate, validates, ValidationError
+from marshmallow import Schema, fields, validate, validates, validates_schema, ValidationError, EXCLUDE
 import re
-from datetime import datetime
+from collections import OrderedDict
+from datetime import date
 
 class CourseRequestSchema(Schema):
     """Schema for course creation and update requests."""
@@ -16,19 +17,19 @@ class CourseRequestSchema(Schema):
     @validates('title')
     def validate_title(self, value):
         """Validate course title."""
-        if not value.strip():
+        if not value or value.isspace():
             raise ValidationError('Course title cannot be empty.')
     
     @validates('description')
     def validate_description(self, value):
         """Validate course description."""
-        if not value.strip():
+        if not value or value.isspace():
             raise ValidationError('Course description cannot be empty.')
     
     @validates('date')
     def validate_date(self, value):
         """Validate that the date is not in the past."""
-        if value < datetime.now().date():
+        if value < date.today():
             raise ValidationError('Course date cannot be in the past.')
 
 
@@ -45,21 +46,82 @@ class CourseSchema(Schema):
     updated_at = fields.DateTime(dump_only=True)
 
 
+# Per-process LRU of dumped course rows keyed by (id, updated_at); every ORM update
+# bumps updated_at, so an edited course is dumped afresh under a new key
+_COURSE_DUMP_CACHE_SIZE = 10000
+_course_dump_cache = OrderedDict()
+
+
+def _dump_course(course):
+    """Serialize a single course the way CourseSchema().dump does."""
+    return {
+        'id': course.id,
+        'title': course.title,
+        'description': course.description,
+        'date': course.date.isoformat() if course.date is not None else None,
+        'total_marks': course.total_marks,
+        'difficulty_rating': course.difficulty_rating,
+        'teacher_id': course.teacher_id,
+        'created_at': course.created_at.isoformat() if course.created_at is not None else None,
+        'updated_at': course.updated_at.isoformat() if course.updated_at is not None else None
+    }
+
+
+def dump_courses(courses):
+    """
+    Serialize courses to the same dictionaries as CourseSchema(many=True).dump.
+    Reads the columns directly instead of going through marshmallow's per-field
+    dispatch, which dominates the cost of the paginated list endpoints, and reuses
+    the dump of any course version seen before.
+    Accepts Course instances or rows selected with COURSE_LIST_COLUMNS.
+    The returned dictionaries may be shared and must not be modified.
+    """
+    result = []
+    for course in courses:
+        if course.updated_at is None:
+            result.append(_dump_course(course))
+            continue
+        
+        key = (course.id, course.updated_at)
+        data = _course_dump_cache.get(key)
+        if data is None:
+            data = _course_dump_cache[key] = _dump_course(course)
+            if len(_course_dump_cache) > _COURSE_DUMP_CACHE_SIZE:
+                _course_dump_cache.popitem(last=False)
+        else:
+            try:
+                _course_dump_cache.move_to_end(key)
+            except KeyError:
+                # Evicted by a concurrent request in the meantime
+                pass
+        result.append(data)
+    return result
+
+
 class CourseFiltersSchema(Schema):
     """Schema for filtering courses."""
+    class Meta:
+        # Pagination parameters share the query string with the filters
+        unknown = EXCLUDE
+    
     title = fields.Str()
     difficulty = fields.Str(validate=validate.OneOf(['easy', 'medium', 'hard', 'advanced']))
     dateFrom = fields.Date()
     dateTo = fields.Date()
     
-    @validates('dateFrom')
-    def validate_date_from(self, value):
-        """Validate dateFrom format."""
-        if value and value > datetime.now().date():
-            raise ValidationError('dateFrom cannot be in the future.')
-    
-    @validates('dateTo')
-    def validate_date_to(self, value):
-        """Validate dateTo format."""
-        if value and value < datetime.now().date():
-            raise ValidationError('dateTo cannot be in the past.')
\ No newline at end of file
+    @validates_schema(skip_on_field_errors=False)
+    def validate_date_range(self, data, **kwargs):
+        """Validate dateFrom and dateTo against a single reading of today's date."""
+        date_from = data.get('dateFrom')
+        date_to = data.get('dateTo')
+        if not date_from and not date_to:
+            return
+        
+        today = date.today()
+        errors = {}
+        if date_from and date_from > today:
+            errors['dateFrom'] = ['dateFrom cannot be in the future.']
+        if date_to and date_to < today:
+            errors['dateTo'] = ['dateTo cannot be in the past.']
+        if errors:
+            raise ValidationError(errors)
\ No newline at end of file
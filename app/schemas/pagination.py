@@ -5,19 +5,16 @@ Used for paginating API responses that return collections.
 from marshmallow import Schema, fields, validate, validates, ValidationError, post_dump
 
 class PaginationSchema(Schema):
-    """Schema for pagination metadata."""
-    page = fields.Int(dump_only=True)
+    """Schema for cursor (keyset) pagination metadata."""
     per_page = fields.Int(dump_only=True)
-    total_pages = fields.Int(dump_only=True)
-    total_items = fields.Int(dump_only=True)
     has_next = fields.Bool(dump_only=True)
     has_prev = fields.Bool(dump_only=True)
     
-    # Optional fields for navigation links
+    # Opaque cursor to pass as ?cursor= to fetch the next page
+    next_cursor = fields.Str(dump_only=True)
+    
+    # Optional field for navigation links
     next_url = fields.Str(dump_only=True)
-    prev_url = fields.Str(dump_only=True)
-    first_url = fields.Str(dump_only=True)
-    last_url = fields.Str(dump_only=True)
     
     @post_dump
     def remove_none_values(self, data, **kwargs):
@@ -39,4 +36,18 @@ class PaginatedResponseSchema(Schema):
         return {
             "status": "success",
             "data": data
-        }
\ No newline at end of file
+        }
+
+
+def paginated_response(items, pagination):
+    """
+    Build the same envelope as PaginatedResponseSchema().dump for already
+    serialized items, without a marshmallow pass over the page.
+    """
+    return {
+        "status": "success",
+        "data": {
+            "items": items,
+            "pagination": {key: value for key, value in pagination.items() if value is not None}
+        }
+    }
@@ -4,10 +4,15 @@ User related schemas for the Teacher Dashboard application.
 from marshmallow import Schema, fields, validate, validates, validates_schema, ValidationError
 import re
 
+# Stricter than fields.Email alone: the domain must end in a 2+ letter TLD
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_email_format = validate.Regexp(_EMAIL_RE, error='Invalid email format.')
+
+
 class UserSchema(Schema):
     """Schema for user serialization and validation."""
     id = fields.Int(dump_only=True)
-    email = fields.Email(required=True)
+    email = fields.Email(required=True, validate=_email_format)
     name = fields.Str(required=True, validate=validate.Length(min=2, max=100))
     role = fields.Str(required=True, validate=validate.OneOf(['teacher', 'student']))
     
@@ -18,12 +23,6 @@ class UserSchema(Schema):
     created_at = fields.DateTime(dump_only=True)
     updated_at = fields.DateTime(dump_only=True)
     
-    @validates('email')
-    def validate_email(self, value):
-        """Custom validation for email addresses."""
-        if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', value):
-            raise ValidationError('Invalid email format.')
-    
     @validates('password')
     def validate_password(self, value):
         """Validate password strength."""
@@ -31,6 +30,21 @@ class UserSchema(Schema):
             raise ValidationError('Password must be at least 8 characters.')
 
 
+def dump_user(user):
+    """
+    Serialize a user to the same dictionary as UserSchema().dump, reading the
+    columns directly instead of going through marshmallow's per-field dispatch.
+    """
+    return {
+        'id': user.id,
+        'email': user.email,
+        'name': user.name,
+        'role': user.role,
+        'created_at': user.created_at.isoformat() if user.created_at is not None else None,
+        'updated_at': user.updated_at.isoformat() if user.updated_at is not None else None
+    }
+
+
 class LoginSchema(Schema):
     """Schema for login requests."""
     email = fields.Email(required=True)
@@ -40,31 +54,19 @@ class LoginSchema(Schema):
 
 class UserCreateSchema(Schema):
     """Schema for user creation requests."""
-    email = fields.Email(required=True)
+    email = fields.Email(required=True, validate=_email_format)
     password = fields.Str(required=True, validate=validate.Length(min=8))
     name = fields.Str(required=True, validate=validate.Length(min=2, max=100))
     role = fields.Str(required=True, validate=validate.OneOf(['teacher', 'student']))
-    
-    @validates('email')
-    def validate_email(self, value):
-        """Custom validation for email addresses."""
-        if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', value):
-            raise ValidationError('Invalid email format.')
 
 
 class UserUpdateSchema(Schema):
     """Schema for user update requests."""
-    email = fields.Email()
+    email = fields.Email(validate=_email_format)
     name = fields.Str(validate=validate.Length(min=2, max=100))
     current_password = fields.Str()
     new_password = fields.Str(validate=validate.Length(min=8))
     
-    @validates('email')
-    def validate_email(self, value):
-        """Custom validation for email addresses."""
-        if value and not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', value):
-            raise ValidationError('Invalid email format.')
-    
     @validates_schema
     def validate_password_change(self, data, **kwargs):
         """Validate that current password is provided when changing password."""
@@ -7,6 +7,8 @@ from app.utils.security import (
     teacher_required, 
     student_required, 
     resource_owner_required, 
+    teacher_owner_required, 
     hash_password, 
     verify_password
-)
\ No newline at end of file
+)
+from app.utils.json_provider import ORJSONProvider
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+Cache helpers for the Teacher Dashboard application.
+Keys and invalidation for the cached class roster and course list responses,
+each student's enrolled class ids and each user's paginated course listings.
+"""
+import uuid
+
+from flask import request
+from sqlalchemy import select
+
+from app import db, cache
+
+# Enrollments only change on explicit enroll/unenroll, which invalidate the entry
+ENROLLMENT_CACHE_TIMEOUT = 600
+
+# Course listings are dropped on every write that affects them; the short TTL bounds staleness
+COURSE_LIST_CACHE_TIMEOUT = 60
+
+
+def class_students_key(class_id):
+    """Cache key for the students enrolled in a class."""
+    return f"class:{class_id}:students"
+
+
+def class_courses_key(class_id):
+    """Cache key for the courses assigned to a class."""
+    return f"class:{class_id}:courses"
+
+
+def student_classes_key(student_id):
+    """Cache key for the ids of the classes a student is enrolled in."""
+    return f"enroll:user:{student_id}:classes"
+
+
+def course_list_version_key(user_id):
+    """Cache key for the version token embedded in a user's course listing keys."""
+    return f"courses:{user_id}:version"
+
+
+def course_list_key(user_id):
+    """
+    Cache key for one page of a user's course listing, taken from the current request URL.
+    Every key embeds the user's version token, so dropping the token orphans all their pages.
+    """
+    version = cache.get(course_list_version_key(user_id))
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(course_list_version_key(user_id), version, timeout=0)
+    return f"courses:{user_id}:{version}:{request.full_path}"
+
+
+def invalidate_class_students(*class_ids):
+    """Drop the cached student lists of the given classes."""
+    if class_ids:
+        cache.delete_many(*[class_students_key(class_id) for class_id in class_ids])
+
+
+def invalidate_class_courses(*class_ids):
+    """Drop the cached course lists of the given classes."""
+    if class_ids:
+        cache.delete_many(*[class_courses_key(class_id) for class_id in class_ids])
+
+
+def invalidate_student_classes(*student_ids):
+    """Drop the cached enrolled class ids and course listings of the given students."""
+    if student_ids:
+        cache.delete_many(*[student_classes_key(student_id) for student_id in student_ids])
+        invalidate_course_lists(*student_ids)
+
+
+def invalidate_course_lists(*user_ids):
+    """Drop the cached course listings of the given users."""
+    if user_ids:
+        cache.delete_many(*[course_list_version_key(user_id) for user_id in user_ids])
+
+
+def invalidate_class_course_lists(*class_ids):
+    """Drop the cached course listings of every student enrolled in the given classes."""
+    from app.models.associations import ClassStudent
+    
+    if class_ids:
+        student_ids = db.session.execute(
+            select(ClassStudent.student_id).where(ClassStudent.class_id.in_(class_ids)).distinct()
+        ).scalars().all()
+        invalidate_course_lists(*student_ids)
@@ -0,0 +1,122 @@
+"""
+Cursor (keyset) pagination helpers for the Teacher Dashboard application.
+Pages are addressed by an opaque cursor holding the sort key of the last row
+returned, so fetching a page never counts or skips over earlier rows.
+"""
+import base64
+import binascii
+import datetime
+import json
+
+from flask import request
+from sqlalchemy import literal, tuple_
+
+
+def encode_cursor(values):
+    """
+    Encode a row's sort key values as an opaque URL-safe cursor.
+
+    Args:
+        values: Sort key values of the last row on the page
+
+    Returns:
+        A base64url string
+    """
+    payload = json.dumps(
+        [v.isoformat() if isinstance(v, datetime.date) else v for v in values]
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor, keys):
+    """
+    Decode a cursor produced by encode_cursor for the given sort keys.
+
+    Args:
+        cursor: The opaque cursor string
+        keys: The model columns the cursor values belong to
+
+    Returns:
+        List of sort key values converted to the columns' Python types
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise ValueError("Invalid cursor")
+
+    decoded = []
+    for key, value in zip(keys, values):
+        python_type = key.type.python_type
+        try:
+            if python_type is datetime.date:
+                decoded.append(datetime.date.fromisoformat(value))
+            else:
+                decoded.append(python_type(value))
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+    return decoded
+
+
+def keyset_page(query, keys, cursor, per_page, descending=False):
+    """
+    Fetch one page of a query using keyset pagination.
+
+    Args:
+        query: The filtered (unordered) query to paginate
+        keys: Model columns forming a unique sort key, e.g. (Course.date, Course.id)
+        cursor: Cursor returned for the previous page, or None for the first page
+        per_page: Maximum number of items to return
+        descending: Whether to sort the keys in descending order
+
+    Returns:
+        Tuple of (items, next_cursor); next_cursor is None on the last page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if cursor:
+        position = tuple_(*keys)
+        bound = tuple_(*[
+            literal(value, key.type) for key, value in zip(keys, decode_cursor(cursor, keys))
+        ])
+        query = query.filter(position < bound if descending else position > bound)
+
+    order = [key.desc() for key in keys] if descending else list(keys)
+
+    # Fetch one extra row to learn whether another page follows
+    items = query.order_by(*order).limit(per_page + 1).all()
+
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        next_cursor = encode_cursor([getattr(items[-1], key.key) for key in keys])
+
+    return items, next_cursor
+
+
+def cursor_pagination(per_page, cursor, next_cursor):
+    """
+    Build the pagination metadata for a keyset-paginated response.
+
+    Args:
+        per_page: Number of items per page
+        cursor: Cursor the current page was requested with, if any
+        next_cursor: Cursor for the following page, if any
+
+    Returns:
+        Dictionary matching PaginationSchema
+    """
+    return {
+        'per_page': per_page,
+        'has_next': next_cursor is not None,
+        'has_prev': bool(cursor),
+        'next_cursor': next_cursor,
+        'next_url': (request.base_url + f'?cursor={next_cursor}&per_page={per_page}')
+                    if next_cursor else None
+    }
@@ -0,0 +1,50 @@
+"""
+Database helpers for the Teacher Dashboard application.
+Server-side SQL functions and transaction-level tuning for write paths that
+do not need full durability.
+"""
+from sqlalchemy import DateTime, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+
+from app import db
+
+
+def relax_commit_durability():
+    """
+    Let the current transaction commit without waiting for its WAL flush (PostgreSQL only).
+
+    The change is visible to other requests as soon as the commit returns and the
+    database stays consistent; a server crash can only lose the last few hundred
+    milliseconds of such commits. Meant for low-stakes edits, never for account
+    credentials. Does nothing on other databases.
+    """
+    if db.session.get_bind().dialect.name == 'postgresql':
+        db.session.execute(text("SET LOCAL synchronous_commit = off"))
+
+
+class utcnow(FunctionElement):
+    """
+    The current UTC timestamp, computed by the database.
+
+    Used as the server-side default for timestamp columns, so inserts and
+    updates do not build a datetime in Python for every row.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, 'postgresql')
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow, 'sqlite')
+def _utcnow_sqlite(element, compiler, **kw):
+    # CURRENT_TIMESTAMP only has whole-second precision on SQLite
+    return "STRFTIME('%Y-%m-%d %H:%M:%f', 'now')"
@@ -0,0 +1,49 @@
+"""
+JSON provider for the Teacher Dashboard application.
+Encodes and decodes request/response bodies with orjson instead of the stdlib json module.
+"""
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+    Keeps Flask's defaults: sorted keys, indented output in debug mode and
+    DefaultJSONProvider.default for types orjson cannot encode natively.
+    """
+
+    def _options(self, indent=False):
+        """Build the orjson option flags for a dump."""
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        """Serialize data as a JSON string."""
+        return orjson.dumps(
+            obj,
+            default=kwargs.get('default', self.default),
+            option=self._options(indent=bool(kwargs.get('indent')))
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        """Deserialize data from a JSON string or bytes."""
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Serialize the arguments straight to response bytes."""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+
+        return self._app.response_class(
+            orjson.dumps(
+                obj,
+                default=self.default,
+                option=self._options(indent=indent) | orjson.OPT_APPEND_NEWLINE
+            ),
+            mimetype=self.mimetype
+        )
@@ -2,10 +2,25 @@
 Security utilities for the Teacher Dashboard application.
 Contains decorators and helpers for authentication and authorization.
 """
+import hmac
+import secrets
+import time
+from collections import OrderedDict
 from functools import wraps
 from flask import current_app, jsonify, request, g
 from flask_login import current_user
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
+import bcrypt
+
+def _get_user():
+    """
+    Return the current user object, resolving the current_user proxy once per request.
+    Stacked decorators then read plain attributes instead of going through the proxy.
+    """
+    if '_security_user' not in g:
+        g._security_user = current_user._get_current_object()
+    return g._security_user
+
 
 def teacher_required(f):
     """
@@ -14,10 +29,11 @@ def teacher_required(f):
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated:
+        user = _get_user()
+        if not user.is_authenticated:
             return jsonify({"status": "error", "message": "Authentication required"}), 401
         
-        if current_user.role != 'teacher':
+        if user.role != 'teacher':
             return jsonify({"status": "error", "message": "Teacher access required"}), 403
         
         return f(*args, **kwargs)
@@ -31,10 +47,11 @@ def student_required(f):
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated:
+        user = _get_user()
+        if not user.is_authenticated:
             return jsonify({"status": "error", "message": "Authentication required"}), 401
         
-        if current_user.role != 'student':
+        if user.role != 'student':
             return jsonify({"status": "error", "message": "Student access required"}), 403
         
         return f(*args, **kwargs)
@@ -56,7 +73,8 @@ def resource_owner_required(model, id_param='id', owner_field='teacher_id'):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            if not current_user.is_authenticated:
+            user = _get_user()
+            if not user.is_authenticated:
                 return jsonify({"status": "error", "message": "Authentication required"}), 401
             
             # Get the resource ID from the route parameters
@@ -64,13 +82,62 @@ def resource_owner_required(model, id_param='id', owner_field='teacher_id'):
             if not resource_id:
                 return jsonify({"status": "error", "message": "Resource ID not provided"}), 400
             
-            # Get the resource from the database
-            resource = model.query.get(resource_id)
+            # Get the resource, from the session's identity map if it is already loaded
+            from app import db
+            resource = db.session.get(model, resource_id)
             if not resource:
                 return jsonify({"status": "error", "message": "Resource not found"}), 404
             
             # Check if the current user owns the resource
-            if getattr(resource, owner_field) != current_user.id:
+            if getattr(resource, owner_field) != user.id:
+                return jsonify({"status": "error", "message": "Access denied to this resource"}), 403
+            
+            # Store the resource in g for the view function to use
+            g.resource = resource
+            
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+
+def teacher_owner_required(model, id_param, owner_field='teacher_id'):
+    """
+    Factory for decorators that combine teacher_required and resource_owner_required.
+    
+    The resource is fetched with its ownership condition in a single query; a
+    second lookup only happens on a miss, to tell "not found" from "not yours".
+    
+    Args:
+        model: The SQLAlchemy model to check ownership against
+        id_param: The parameter name in the route that contains the resource ID
+        owner_field: The field name in the model that contains the owner's ID
+    
+    Returns:
+        A decorator function that checks the teacher role and resource ownership
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            user = _get_user()
+            if not user.is_authenticated:
+                return jsonify({"status": "error", "message": "Authentication required"}), 401
+            
+            if user.role != 'teacher':
+                return jsonify({"status": "error", "message": "Teacher access required"}), 403
+            
+            resource_id = kwargs.get(id_param)
+            if not resource_id:
+                return jsonify({"status": "error", "message": "Resource ID not provided"}), 400
+            
+            # Fetch the resource only if the current teacher owns it
+            resource = model.query.filter(
+                model.id == resource_id,
+                getattr(model, owner_field) == user.id
+            ).first()
+            
+            if not resource:
+                if model.query.filter(model.id == resource_id).count() == 0:
+                    return jsonify({"status": "error", "message": "Resource not found"}), 404
                 return jsonify({"status": "error", "message": "Access denied to this resource"}), 403
             
             # Store the resource in g for the view function to use
@@ -81,23 +148,47 @@ def resource_owner_required(model, id_param='id', owner_field='teacher_id'):
     return decorator
 
 
+# Per-worker key for tagging passwords in the verification cache, so raw
+# passwords are never kept in memory and tags are useless outside this process
+_WORKER_KEY = secrets.token_bytes(32)
+
+# Bounded, time-limited cache of verification results keyed by
+# (password hash, HMAC tag of the password) -> (expiry, result)
+_VERIFY_CACHE_SIZE = 4096
+_VERIFY_CACHE_TTL = 60
+_verify_cache = OrderedDict()
+
+
+def _bcrypt_secret(password):
+    """Encode a password for bcrypt, which only uses the first 72 bytes."""
+    return password.encode('utf-8')[:72]
+
+
 def hash_password(password):
     """
     Generate a secure hash of the password.
     
+    Uses bcrypt with the cost factor from the BCRYPT_ROUNDS setting, so the
+    per-login CPU cost is chosen explicitly rather than inherited.
+    
     Args:
         password: The plain text password to hash
         
     Returns:
         A secure hash of the password
     """
-    return generate_password_hash(password)
+    rounds = current_app.config.get('BCRYPT_ROUNDS', 12)
+    return bcrypt.hashpw(_bcrypt_secret(password), bcrypt.gensalt(rounds=rounds)).decode('ascii')
 
 
 def verify_password(password_hash, password):
     """
     Verify that a password matches a hash.
     
+    Hashes created before the switch to bcrypt are still checked with Werkzeug.
+    Results are cached per worker for a short time, so repeated identical
+    attempts skip the hashing work.
+    
     Args:
         password_hash: The stored password hash
         password: The plain text password to verify
@@ -105,4 +196,41 @@ def verify_password(password_hash, password):
     Returns:
         True if the password matches, False otherwise
     """
-    return check_password_hash(password_hash, password)
\ No newline at end of file
+    # Accounts without a stored hash can never match; skip the hashing work
+    if not password_hash or password is None:
+        return False
+    
+    tag = hmac.new(_WORKER_KEY, password.encode('utf-8'), 'sha256').digest()
+    key = (password_hash, tag)
+    now = time.monotonic()
+    
+    cached = _verify_cache.get(key)
+    if cached is not None:
+        if cached[0] > now:
+            try:
+                _verify_cache.move_to_end(key)
+            except KeyError:
+                # Evicted by a concurrent request in the meantime
+                pass
+            return cached[1]
+        # Expired: drop it rather than wait for LRU pressure to evict it
+        _verify_cache.pop(key, None)
+    
+    result = _check_password(password_hash, password)
+    # A fresh assignment to a new key lands at the most recently used end
+    _verify_cache.pop(key, None)
+    _verify_cache[key] = (now + _VERIFY_CACHE_TTL, result)
+    if len(_verify_cache) > _VERIFY_CACHE_SIZE:
+        try:
+            _verify_cache.popitem(last=False)
+        except KeyError:
+            pass
+    return result
+
+
+def _check_password(password_hash, password):
+    """Run the actual bcrypt or Werkzeug hash check."""
+    if password_hash.startswith('$2'):
+        # bcrypt compares the digests in constant time itself
+        return bcrypt.checkpw(_bcrypt_secret(password), password_hash.encode('ascii'))
+    return check_password_hash(password_hash, password)
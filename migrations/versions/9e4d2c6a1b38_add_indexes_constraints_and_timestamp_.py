@@ -0,0 +1,154 @@
+"""Add indexes, constraints and timestamp defaults
+
+Brings a database created from the initial schema up to the current models:
+the keyset pagination and lookup indexes, the unique lower(email) index, CHECK
+constraints on users.role and courses.difficulty_rating, and server-side UTC
+defaults with NOT NULL on every timestamp column (existing NULLs are backfilled).
+
+Revision ID: 9e4d2c6a1b38
+Revises: 5c1f3a2b7d01
+Create Date: 2026-10-15 05:11:15.920990
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.db import utcnow
+
+
+# revision identifiers, used by Alembic.
+revision = '9e4d2c6a1b38'
+down_revision = '5c1f3a2b7d01'
+branch_labels = None
+depends_on = None
+
+user_role = sa.Enum('teacher', 'student', name='user_role', create_constraint=True)
+difficulty_rating = sa.Enum(
+    'easy', 'medium', 'hard', 'advanced', name='difficulty_rating', create_constraint=True
+)
+
+# table -> (created column, updated column or None)
+TIMESTAMP_COLUMNS = {
+    'users': ('created_at', 'updated_at'),
+    'classes': ('created_at', 'updated_at'),
+    'courses': ('created_at', 'updated_at'),
+    'class_courses': ('created_at', None),
+    'class_students': ('enrolled_date', None),
+}
+
+
+def _backfill_timestamps():
+    """Give rows written before the defaults existed a timestamp, so NOT NULL holds."""
+    now = datetime.utcnow()
+    for table_name, (created, updated) in TIMESTAMP_COLUMNS.items():
+        columns = [sa.column(created, sa.DateTime)]
+        if updated:
+            columns.append(sa.column(updated, sa.DateTime))
+        table = sa.table(table_name, *columns)
+        
+        op.execute(table.update().where(table.c[created].is_(None)).values({created: now}))
+        if updated:
+            op.execute(
+                table.update().where(table.c[updated].is_(None)).values({updated: table.c[created]})
+            )
+
+
+def _set_timestamp_defaults(batch_op, table_name, server_default, nullable):
+    """Alter a table's timestamp columns to the given default and nullability."""
+    for column in TIMESTAMP_COLUMNS[table_name]:
+        if column:
+            batch_op.alter_column(
+                column,
+                existing_type=sa.DateTime(),
+                server_default=server_default,
+                nullable=nullable
+            )
+
+
+def upgrade():
+    bind = op.get_bind()
+    is_postgresql = bind.dialect.name == 'postgresql'
+    
+    _backfill_timestamps()
+    
+    if is_postgresql:
+        # Native enum types must exist before columns are converted to them
+        user_role.create(bind, checkfirst=True)
+        difficulty_rating.create(bind, checkfirst=True)
+    
+    with op.batch_alter_table('class_courses', schema=None) as batch_op:
+        _set_timestamp_defaults(batch_op, 'class_courses', utcnow(), False)
+        batch_op.create_index('ix_class_courses_course_id_class_id', ['course_id', 'class_id'], unique=False)
+    
+    with op.batch_alter_table('class_students', schema=None) as batch_op:
+        _set_timestamp_defaults(batch_op, 'class_students', utcnow(), False)
+        batch_op.create_index('ix_class_students_student_id_class_id', ['student_id', 'class_id'], unique=False)
+    
+    with op.batch_alter_table('classes', schema=None) as batch_op:
+        _set_timestamp_defaults(batch_op, 'classes', utcnow(), False)
+        batch_op.create_index('ix_classes_name_id', ['name', 'id'], unique=False)
+    
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.alter_column('difficulty_rating',
+               existing_type=sa.String(length=20),
+               type_=difficulty_rating,
+               existing_nullable=False,
+               postgresql_using='difficulty_rating::difficulty_rating')
+        _set_timestamp_defaults(batch_op, 'courses', utcnow(), False)
+        batch_op.create_index('ix_courses_date_id', ['date', 'id'], unique=False)
+        batch_op.create_index('ix_courses_difficulty_rating', ['difficulty_rating'], unique=False)
+        batch_op.create_index('ix_courses_teacher_id_date_id', ['teacher_id', 'date', 'id'], unique=False)
+    
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.alter_column('role',
+               existing_type=sa.String(length=20),
+               type_=user_role,
+               existing_nullable=False,
+               postgresql_using='role::user_role')
+        _set_timestamp_defaults(batch_op, 'users', utcnow(), False)
+        batch_op.create_index('ix_users_role_id', ['role', 'id'], unique=False)
+    
+    # Expression index, created outside the batch: SQLite cannot reflect it for a table copy
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True)
+
+
+def downgrade():
+    bind = op.get_bind()
+    
+    op.drop_index('ix_users_email_lower', table_name='users')
+    
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_role_id')
+        _set_timestamp_defaults(batch_op, 'users', None, True)
+        batch_op.alter_column('role',
+               existing_type=user_role,
+               type_=sa.String(length=20),
+               existing_nullable=False)
+    
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.drop_index('ix_courses_teacher_id_date_id')
+        batch_op.drop_index('ix_courses_difficulty_rating')
+        batch_op.drop_index('ix_courses_date_id')
+        _set_timestamp_defaults(batch_op, 'courses', None, True)
+        batch_op.alter_column('difficulty_rating',
+               existing_type=difficulty_rating,
+               type_=sa.String(length=20),
+               existing_nullable=False)
+    
+    with op.batch_alter_table('classes', schema=None) as batch_op:
+        batch_op.drop_index('ix_classes_name_id')
+        _set_timestamp_defaults(batch_op, 'classes', None, True)
+    
+    with op.batch_alter_table('class_students', schema=None) as batch_op:
+        batch_op.drop_index('ix_class_students_student_id_class_id')
+        _set_timestamp_defaults(batch_op, 'class_students', None, True)
+    
+    with op.batch_alter_table('class_courses', schema=None) as batch_op:
+        batch_op.drop_index('ix_class_courses_course_id_class_id')
+        _set_timestamp_defaults(batch_op, 'class_courses', None, True)
+    
+    if bind.dialect.name == 'postgresql':
+        difficulty_rating.drop(bind, checkfirst=True)
+        user_role.drop(bind, checkfirst=True)
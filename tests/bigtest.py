@@ -7,24 +7,51 @@ with thorough testing of various scenarios including:
 - Authorization checks
 - Input validation
 - Error handling
+
+Every test runs inside a rolled-back SAVEPOINT on an in-memory database, so
+tests are independent and can be spread over workers with pytest-xdist:
+
+    pytest -n auto tests/bigtest.py
 """
 import pytest
-from flask import json
 from datetime import date, timedelta
-from app import create_app, db
+from app import create_app, db, cache
 from app.models.user import User
 from app.models.course import Course
 from app.models.class_model import Class
 from app.models.associations import ClassStudent, ClassCourse
 
-@pytest.fixture(scope='module')
+# Course dates must lie in the future; computed once for every test
+FUTURE_DATE = (date.today() + timedelta(days=30)).isoformat()
+
+BASE_COURSE_PAYLOAD = {
+    'title': 'Test Course',
+    'description': 'A comprehensive test course',
+    'date': FUTURE_DATE,
+    'total_marks': 100,
+    'difficulty_rating': 'medium'
+}
+
+
+@pytest.fixture(scope='session')
 def test_app():
-    """Create a test application and database."""
+    """Create a test application and database once for the whole test session."""
     app = create_app('app.config.TestConfig')
     
     with app.app_context():
         db.create_all()
-        
+    
+    yield app
+    
+    # TestConfig uses an in-memory database, which goes away with the engine
+    with app.app_context():
+        db.session.remove()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def _seed_users(test_app):
+    """Create the test teacher and student once per test session."""
+    with test_app.app_context():
         # Create test users
         teacher = User(
             email='teacher_test@example.com',
@@ -40,8 +67,7 @@ def test_app():
             password='testpassword'  # Use the __init__ parameter
         )
         
-        db.session.add(teacher)
-        db.session.add(student)
+        db.session.add_all([teacher, student])
         
         try:
             db.session.commit()
@@ -49,176 +75,177 @@ def test_app():
             assert teacher.is_teacher, "Teacher role not set correctly"
             assert not student.is_teacher, "Student role incorrectly set as teacher"
             
-            app.test_teacher_id = teacher.id
-            app.test_student_id = student.id
+            test_app.test_teacher_id = teacher.id
+            test_app.test_student_id = student.id
         except Exception as e:
             db.session.rollback()
             raise
+
+
+@pytest.fixture(scope='session')
+def _db_connection(test_app, _seed_users):
+    """
+    Hold one connection with an open transaction for the whole test session.
     
-    yield app
+    Every session the application creates is bound to this connection and turns
+    its commits into SAVEPOINT releases, so nothing is ever really committed.
+    """
+    with test_app.app_context():
+        engines = db.engines
+        engine = engines[None]
+        connection = engine.connect()
+        transaction = connection.begin()
+        
+        # Flask-SQLAlchemy picks the bind from db.engines, not from the session options
+        engines[None] = connection
+        db.session.remove()
+        db.session.configure(join_transaction_mode='create_savepoint')
     
-    with app.app_context():
+    yield connection
+    
+    with test_app.app_context():
+        db.session.remove()
+        transaction.rollback()
+        connection.close()
+        engines[None] = engine
+
+
+@pytest.fixture(autouse=True)
+def _rollback_after_test(test_app, _db_connection):
+    """Run each test inside a SAVEPOINT that is rolled back on teardown."""
+    nested = _db_connection.begin_nested()
+    
+    yield
+    
+    with test_app.app_context():
         db.session.remove()
-        db.drop_all()
+        # Cached listings may include rows the rollback is about to remove
+        cache.clear()
+    nested.rollback()
 
 
-@pytest.fixture(scope='module')
+@pytest.fixture(scope='session')
 def test_client(test_app):
     """Create a test client for making requests."""
-    with test_app.test_client() as client:
-        # Enable preserving the cookies
-        client.testing = True
-        # Configure to follow redirects (which might occur during login)
-        client.follow_redirects = True
-        yield client
+    # Not entered with `with`: a preserved request context would keep its
+    # session (and SAVEPOINT) open across the per-test rollback
+    client = test_app.test_client()
+    # Enable preserving the cookies
+    client.testing = True
+    # Configure to follow redirects (which might occur during login)
+    client.follow_redirects = True
+    return client
 
 
 # In tests/bigtest.py
 
-@pytest.fixture(scope='module')
-def auth_headers(test_app, test_client):
-    """
-    Provides authentication headers for different user types.
+@pytest.fixture(scope='session')
+def auth_headers(test_app):
     """
-    headers = {'Content-Type': 'application/json'}
+    Provides a logged-in test client for each user type.
     
-    # Login as teacher - save the session cookie properly
-    teacher_response = test_client.post('/api/login', json={
+    Each client keeps its own session cookie in its cookie jar, so requests
+    made through it are authenticated without any Cookie header.
+    """
+    # Login as teacher
+    teacher_client = test_app.test_client()
+    teacher_response = teacher_client.post('/api/login', json={
         'email': 'teacher_test@example.com',
         'password': 'testpassword'
     })
     assert teacher_response.status_code == 200, f"Teacher login failed: {teacher_response.get_json()}"
     
-    # Extract the session cookie correctly
-    teacher_cookies = teacher_response.headers.getlist('Set-Cookie')
-    teacher_cookie_header = '; '.join(teacher_cookies)
-    
-    # Login as student - same approach
-    student_response = test_client.post('/api/login', json={
+    # Login as student
+    student_client = test_app.test_client()
+    student_response = student_client.post('/api/login', json={
         'email': 'student_test@example.com',
         'password': 'testpassword'
     })
     assert student_response.status_code == 200, f"Student login failed: {student_response.get_json()}"
-    student_cookies = student_response.headers.getlist('Set-Cookie')
-    student_cookie_header = '; '.join(student_cookies)
-    
-    # Set up headers with cookies
-    teacher_headers = {
-        **headers,
-        'Cookie': teacher_cookie_header
-    }
-    
-    student_headers = {
-        **headers,
-        'Cookie': student_cookie_header
-    }
     
     return {
-        'teacher': teacher_headers,
-        'student': student_headers
+        'teacher': teacher_client,
+        'student': student_client,
+        # Login responses, so tests can check them without logging in again
+        'teacher_login_json': teacher_response.get_json(),
+        'student_login_json': student_response.get_json()
     }
 
 
-@pytest.fixture(scope='module')
-def test_course(test_app, test_client, auth_headers):
+@pytest.fixture
+def test_course(test_app):
     """
     Create a test course for use in other tests.
+    
+    Inserted through the ORM; test_course_crud covers the POST endpoint.
     """
     with test_app.app_context():
-        course_data = {
-            'title': 'Test Course',
-            'description': 'A comprehensive test course',
-            'date': str(date.today() + timedelta(days=30)),
-            'total_marks': 100,
-            'difficulty_rating': 'medium'
-        }
-        
-        course_response = test_client.post(
-            '/api/courses/',
-            json=course_data,
-            headers=auth_headers['teacher']
+        course = Course(
+            title=BASE_COURSE_PAYLOAD['title'],
+            description=BASE_COURSE_PAYLOAD['description'],
+            date=date.fromisoformat(FUTURE_DATE),
+            total_marks=BASE_COURSE_PAYLOAD['total_marks'],
+            difficulty_rating=BASE_COURSE_PAYLOAD['difficulty_rating'],
+            teacher_id=test_app.test_teacher_id
         )
-        
-        assert course_response.status_code == 201, f"Course creation failed: {course_response.get_json()}"
-        return json.loads(course_response.data)['data']
+        db.session.add(course)
+        db.session.commit()
+        return course.to_dict()
 
 
-@pytest.fixture(scope='module')
-def test_class(test_app, test_client, auth_headers):
+@pytest.fixture
+def test_class(test_app):
     """
     Create a test class for use in other tests.
+    
+    Inserted through the ORM; test_class_crud covers the POST endpoint.
     """
     with test_app.app_context():
-        class_data = {
-            'name': 'Test Mathematics Class',
-            'section_number': 'A'
-        }
-        
-        class_response = test_client.post(
-            '/api/classes/',
-            json=class_data,
-            headers=auth_headers['teacher']
+        class_item = Class(
+            name='Test Mathematics Class',
+            section_number='A',
+            teacher_id=test_app.test_teacher_id
         )
-        
-        assert class_response.status_code == 201, f"Class creation failed: {class_response.get_json()}"
-        return json.loads(class_response.data)['data']
+        db.session.add(class_item)
+        db.session.commit()
+        return class_item.to_dict()
 
 
-def test_authentication(test_app, test_client):
+@pytest.mark.parametrize('role', ['teacher', 'student'])
+def test_authentication(test_client, auth_headers, role):
     """
     Test authentication endpoints.
     """
-    # Test login with correct credentials
-    login_response = test_client.post('/api/login', json={
-        'email': 'teacher_test@example.com',
-        'password': 'testpassword'
-    }, follow_redirects=True)
-    
-    # Convert response to JSON
-    login_data = login_response.get_json()
+    # The successful login already happened in the auth_headers fixture
+    login_data = auth_headers[f'{role}_login_json']
     
-    assert login_response.status_code == 200, f"Login failed: {login_data}"
     assert login_data.get('success') is True, "Login response missing success flag"
-    assert login_data.get('user', {}).get('email') == 'teacher_test@example.com'
+    assert login_data.get('user', {}).get('email') == f'{role}_test@example.com'
     
     # Test login with incorrect credentials
     login_fail_response = test_client.post('/api/login', json={
-        'email': 'teacher_test@example.com',
+        'email': f'{role}_test@example.com',
         'password': 'wrongpassword'
     })
     assert login_fail_response.status_code == 401
 
 
-def test_course_crud(test_app, test_client, auth_headers, test_course):
+def test_course_crud(test_app, auth_headers, test_course):
     """
     Test CRUD operations for courses.
     """
-    # First verify the teacher's authentication status
-    auth_check = test_client.get('/api/user', headers=auth_headers['teacher'])
-    assert auth_check.status_code == 200, "Teacher authentication check failed"
-    auth_data = json.loads(auth_check.data)
-    assert auth_data['user']['role'] == 'teacher', f"User role is {auth_data['user']['role']}, expected 'teacher'"
-    
     # Create course
-    course_data = {
-        'title': 'Test Course',
-        'description': 'A comprehensive test course',
-        'date': str(date.today() + timedelta(days=30)),
-        'total_marks': 100,
-        'difficulty_rating': 'medium'
-    }
+    course_data = BASE_COURSE_PAYLOAD
     
-    create_response = test_client.post(
+    create_response = auth_headers['teacher'].post(
         '/api/courses/',
-        json=course_data,
-        headers=auth_headers['teacher']
+        json=course_data
     )
     
     # If creation fails, print detailed error information
     if create_response.status_code != 201:
         print(f"Course creation failed with status {create_response.status_code}")
         print(f"Response data: {create_response.get_json()}")
-        print(f"Headers used: {auth_headers['teacher']}")
         
     assert create_response.status_code == 201, f"Course creation failed: {create_response.get_json()}"
     
@@ -228,97 +255,161 @@ def test_course_crud(test_app, test_client, auth_headers, test_course):
         'title': 'Updated Test Course',
         'description': 'An updated comprehensive test course'
     }
-    update_response = test_client.put(
+    update_response = auth_headers['teacher'].put(
         f'/api/courses/{test_course["id"]}', 
-        json=update_data, 
-        headers=auth_headers['teacher']
+        json=update_data
     )
     assert update_response.status_code == 200
-    updated_course = json.loads(update_response.data)['data']
+    updated_course = update_response.get_json()['data']
     assert updated_course['title'] == 'Updated Test Course'
     
     # Get course details
-    get_course_response = test_client.get(
-        f'/api/courses/{test_course["id"]}', 
-        headers=auth_headers['teacher']
+    get_course_response = auth_headers['teacher'].get(
+        f'/api/courses/{test_course["id"]}'
     )
     assert get_course_response.status_code == 200
     
     # Delete course
-    delete_response = test_client.delete(
-        f'/api/courses/{test_course["id"]}', 
-        headers=auth_headers['teacher']
+    delete_response = auth_headers['teacher'].delete(
+        f'/api/courses/{test_course["id"]}'
     )
     assert delete_response.status_code == 200
 
 
-def test_class_crud(test_app, test_client, auth_headers, test_class):
+def test_class_crud(test_app, auth_headers, test_class):
     """
     Test CRUD operations for classes.
     """
+    # Create class
+    create_response = auth_headers['teacher'].post(
+        '/api/classes/',
+        json={
+            'name': 'Test Mathematics Class',
+            'section_number': 'A'
+        }
+    )
+    assert create_response.status_code == 201, f"Class creation failed: {create_response.get_json()}"
+    
     # Update class
     update_data = {
         'name': 'Updated Test Mathematics Class',
         'section_number': 'B'
     }
-    update_response = test_client.put(
+    update_response = auth_headers['teacher'].put(
         f'/api/classes/{test_class["id"]}', 
-        json=update_data, 
-        headers=auth_headers['teacher']
+        json=update_data
     )
     assert update_response.status_code == 200
-    updated_class = json.loads(update_response.data)['data']
+    updated_class = update_response.get_json()['data']
     assert updated_class['name'] == 'Updated Test Mathematics Class'
     
     # Get class details
-    get_class_response = test_client.get(
-        f'/api/classes/{test_class["id"]}', 
-        headers=auth_headers['teacher']
+    get_class_response = auth_headers['teacher'].get(
+        f'/api/classes/{test_class["id"]}'
     )
     assert get_class_response.status_code == 200
     
     # Attempt to add a student to the class
+    # Only the ORM lookup needs an app context; the client pushes its own
     with test_app.app_context():
         student = User.query.filter_by(role='student').first()
-        student_data = {'student_id': student.id}
-        
-        add_student_response = test_client.post(
-            f'/api/classes/{test_class["id"]}/students', 
-            json=student_data, 
-            headers=auth_headers['teacher']
-        )
-        assert add_student_response.status_code == 200
+        student_data = {'student_id': student.id, 'class_id': test_class["id"]}
+    
+    add_student_response = auth_headers['teacher'].post(
+        f'/api/classes/{test_class["id"]}/students', 
+        json=student_data
+    )
+    assert add_student_response.status_code == 200
     
     # Delete class
-    delete_response = test_client.delete(
-        f'/api/classes/{test_class["id"]}', 
-        headers=auth_headers['teacher']
+    delete_response = auth_headers['teacher'].delete(
+        f'/api/classes/{test_class["id"]}'
     )
     assert delete_response.status_code == 200
 
 
-def test_student_endpoints(test_app, test_client, auth_headers):
+def test_bulk_student_operations(test_app, auth_headers, test_class):
+    """
+    Test bulk enrollment and removal, including duplicate and invalid IDs.
+    """
+    with test_app.app_context():
+        other_student = User(
+            email='bulk_student@example.com',
+            name='Bulk Student',
+            role='student',
+            password='testpassword'
+        )
+        db.session.add(other_student)
+        db.session.commit()
+        other_student_id = other_student.id
+    
+    student_id = test_app.test_student_id
+    teacher_id = test_app.test_teacher_id
+    missing_id = other_student_id + 1000
+    url = f'/api/classes/{test_class["id"]}/students/bulk'
+    
+    # Enroll one student up front so the bulk add finds it already enrolled
+    add_response = auth_headers['teacher'].post(
+        f'/api/classes/{test_class["id"]}/students',
+        json={'student_id': student_id, 'class_id': test_class["id"]}
+    )
+    assert add_response.status_code == 200
+    
+    bulk_add_response = auth_headers['teacher'].post(url, json={
+        'student_ids': [student_id, other_student_id, other_student_id, teacher_id, missing_id, missing_id]
+    })
+    assert bulk_add_response.status_code == 200, f"Bulk add failed: {bulk_add_response.get_json()}"
+    details = bulk_add_response.get_json()['details']
+    assert [s['id'] for s in details['success']] == [other_student_id]
+    assert [s['id'] for s in details['already_enrolled']] == [student_id]
+    assert details['not_students'] == [teacher_id]
+    assert details['not_found'] == [missing_id]
+    
+    roster_response = auth_headers['teacher'].get(f'/api/classes/{test_class["id"]}/students')
+    assert roster_response.status_code == 200
+    roster_ids = sorted(s['id'] for s in roster_response.get_json()['data'])
+    assert roster_ids == sorted([student_id, other_student_id])
+    
+    # A repeated ID is removed and reported once
+    bulk_remove_response = auth_headers['teacher'].delete(url, json={
+        'student_ids': [other_student_id, missing_id, other_student_id]
+    })
+    assert bulk_remove_response.status_code == 200, f"Bulk remove failed: {bulk_remove_response.get_json()}"
+    details = bulk_remove_response.get_json()['details']
+    assert [s['id'] for s in details['success']] == [other_student_id]
+    assert details['not_enrolled'] == []
+    assert details['not_found'] == [missing_id]
+    
+    # A later request finds it no longer enrolled
+    bulk_remove_response = auth_headers['teacher'].delete(url, json={'student_ids': [other_student_id]})
+    assert bulk_remove_response.status_code == 200
+    details = bulk_remove_response.get_json()['details']
+    assert details['success'] == []
+    assert [s['id'] for s in details['not_enrolled']] == [other_student_id]
+    
+    roster_response = auth_headers['teacher'].get(f'/api/classes/{test_class["id"]}/students')
+    assert [s['id'] for s in roster_response.get_json()['data']] == [student_id]
+
+
+def test_student_endpoints(test_app, auth_headers):
     """
     Test student-specific endpoints.
     """
     # Get student courses
-    student_courses_response = test_client.get(
-        '/api/students/courses', 
-        headers=auth_headers['student']
+    student_courses_response = auth_headers['student'].get(
+        '/api/students/courses'
     )
     assert student_courses_response.status_code == 200
     
     # Get student classes
-    student_classes_response = test_client.get(
-        '/api/students/classes', 
-        headers=auth_headers['student']
+    student_classes_response = auth_headers['student'].get(
+        '/api/students/classes'
     )
     assert student_classes_response.status_code == 200
     
     # Get student profile
-    student_profile_response = test_client.get(
-        '/api/students/profile', 
-        headers=auth_headers['student']
+    student_profile_response = auth_headers['student'].get(
+        '/api/students/profile'
     )
     assert student_profile_response.status_code == 200
     
@@ -328,74 +419,183 @@ def test_student_endpoints(test_app, test_client, auth_headers):
         'current_password': 'testpassword',
         'new_password': 'newpassword123'
     }
-    update_profile_response = test_client.put(
+    update_profile_response = auth_headers['student'].put(
         '/api/students/profile', 
-        json=update_profile_data, 
-        headers=auth_headers['student']
+        json=update_profile_data
     )
     assert update_profile_response.status_code == 200
     
     # Verify profile was updated
-    updated_profile = json.loads(update_profile_response.data)['data']
+    updated_profile = update_profile_response.get_json()['data']
     assert updated_profile['name'] == 'Updated Student Name'
 
 
-def test_authorization_checks(test_app, test_client, auth_headers):
+@pytest.fixture
+def paginated_data(test_app):
     """
-    Test various authorization scenarios.
+    Create enough courses and classes to span several pages.
+    
+    Courses share dates and classes share names, so the keyset comparison has
+    to fall back to the id to order ties. Every course is assigned to one class
+    the test student is enrolled in.
     """
-    # Attempt student to access teacher endpoints
     with test_app.app_context():
-        # Try to create a course as a student
-        course_data = {
-            'title': 'Unauthorized Course',
-            'description': 'Should not be created',
-            'date': str(date.today() + timedelta(days=30)),
-            'total_marks': 100,
-            'difficulty_rating': 'medium'
-        }
+        classes = [
+            Class(name=f'Paging Class {i // 2}', section_number=str(i),
+                  teacher_id=test_app.test_teacher_id)
+            for i in range(5)
+        ]
+        db.session.add_all(classes)
+        db.session.flush()
         
-        # Create course as student (should fail)
-        unauthorized_course_response = test_client.post(
-            '/api/courses/', 
-            json=course_data, 
-            headers=auth_headers['student']
-        )
-        assert unauthorized_course_response.status_code == 403
+        courses = [
+            Course(
+                title=f'Paging Course {i}',
+                description='Spread over several pages',
+                date=date.fromisoformat(FUTURE_DATE) + timedelta(days=i // 3),
+                total_marks=100,
+                difficulty_rating='easy',
+                teacher_id=test_app.test_teacher_id
+            )
+            for i in range(7)
+        ]
+        db.session.add_all(courses)
+        db.session.flush()
         
-        # Try to access teacher courses as student
-        unauthorized_courses_response = test_client.get(
-            '/api/courses/', 
-            headers=auth_headers['student']
+        db.session.add_all(
+            ClassStudent(class_id=class_item.id, student_id=test_app.test_student_id)
+            for class_item in classes
         )
-        assert unauthorized_courses_response.status_code == 200  # Will return student's courses
+        db.session.add_all(ClassCourse(class_id=classes[0].id, course_id=course.id) for course in courses)
+        db.session.commit()
+        
+        return {
+            # Listing orders: newest course first, classes by name
+            'course_ids': [course.id for course in sorted(courses, key=lambda c: (c.date, c.id), reverse=True)],
+            'class_ids': [class_item.id for class_item in sorted(classes, key=lambda c: (c.name, c.id))]
+        }
+
+
+def _walk_pages(client, url, per_page):
+    """Follow next_cursor through a listing and return the ids in page order."""
+    ids = []
+    cursor = None
+    
+    while True:
+        query = f'?per_page={per_page}' + (f'&cursor={cursor}' if cursor else '')
+        response = client.get(url + query)
+        assert response.status_code == 200, f"{url} page failed: {response.get_json()}"
+        
+        data = response.get_json()['data']
+        pagination = data['pagination']
+        assert len(data['items']) <= per_page
+        assert pagination['has_prev'] is (cursor is not None)
+        ids.extend(item['id'] for item in data['items'])
+        
+        if not pagination['has_next']:
+            assert 'next_cursor' not in pagination, "Last page returned a next_cursor"
+            return ids
+        
+        assert len(data['items']) == per_page, "Only the last page may be short"
+        cursor = pagination['next_cursor']
+
+
+@pytest.mark.parametrize('role, url, expected', [
+    ('teacher', '/api/courses/', 'course_ids'),
+    ('student', '/api/courses/', 'course_ids'),
+    ('student', '/api/students/courses', 'course_ids'),
+    ('student', '/api/students/classes', 'class_ids'),
+])
+@pytest.mark.parametrize('per_page', [1, 2, 3, 100])
+def test_cursor_pagination(auth_headers, paginated_data, role, url, expected, per_page):
+    """Walking a listing page by page returns every row once, in order."""
+    ids = _walk_pages(auth_headers[role], url, per_page)
+    
+    assert ids == paginated_data[expected], f"{url} pages have duplicates, gaps or a wrong order"
+
+
+@pytest.mark.parametrize('role, url', [
+    ('teacher', '/api/courses/'),
+    ('student', '/api/students/courses'),
+    ('student', '/api/students/classes'),
+])
+@pytest.mark.parametrize('cursor', [
+    'not-a-cursor!',
+    # Valid base64 of JSON with the wrong number of values
+    'WzFd',
+    # Valid base64 of a two-value list that does not match the sort key types
+    'WyJub3QtYS1kYXRlIiwgIngiXQ==',
+])
+def test_cursor_pagination_malformed_cursor(auth_headers, paginated_data, role, url, cursor):
+    """A cursor that does not decode to the listing's sort key is rejected."""
+    response = auth_headers[role].get(f'{url}?cursor={cursor}')
+    
+    assert response.status_code == 400, f"{url} accepted cursor {cursor!r}"
 
 
-def test_auth_status(test_client, auth_headers):
-    """Verify the authentication status is working correctly."""
-    # Test teacher authentication
-    teacher_response = test_client.get('/api/isLoggedIn', headers=auth_headers['teacher'])
-    teacher_data = json.loads(teacher_response.data)
-    print(f"Teacher auth status response: {teacher_data}")
+@pytest.mark.parametrize('requested, clamped', [('0', 1), ('-5', 1), ('1', 1), ('1000', 100)])
+@pytest.mark.parametrize('role, url, expected', [
+    ('teacher', '/api/courses/', 'course_ids'),
+    ('student', '/api/students/courses', 'course_ids'),
+    ('student', '/api/students/classes', 'class_ids'),
+])
+def test_cursor_pagination_per_page_clamped(auth_headers, paginated_data, role, url, expected,
+                                            requested, clamped):
+    """per_page is clamped to 1..100."""
+    response = auth_headers[role].get(f'{url}?per_page={requested}')
+    assert response.status_code == 200
     
-    assert teacher_response.status_code == 200, "Teacher auth check failed"
-    assert teacher_data.get('isAuthenticated') is True, "Teacher not authenticated"
-    assert teacher_data.get('user', {}).get('role') == 'teacher', "Teacher role incorrect"
-    assert teacher_data.get('user', {}).get('is_teacher') is True, "Teacher is_teacher property incorrect"
+    data = response.get_json()['data']
+    assert data['pagination']['per_page'] == clamped
+    assert len(data['items']) == min(clamped, len(paginated_data[expected]))
+
+
+def test_authorization_checks(test_app, auth_headers):
+    """
+    Test various authorization scenarios.
+    """
+    # Attempt student to access teacher endpoints
+    # Try to create a course as a student
+    course_data = {
+        **BASE_COURSE_PAYLOAD,
+        'title': 'Unauthorized Course',
+        'description': 'Should not be created'
+    }
     
-    # Test student authentication
-    student_response = test_client.get('/api/isLoggedIn', headers=auth_headers['student'])
-    student_data = json.loads(student_response.data)
-    print(f"Student auth status response: {student_data}")
+    # Create course as student (should fail)
+    unauthorized_course_response = auth_headers['student'].post(
+        '/api/courses/', 
+        json=course_data
+    )
+    assert unauthorized_course_response.status_code == 403
     
-    assert student_response.status_code == 200, "Student auth check failed"
-    assert student_data.get('isAuthenticated') is True, "Student not authenticated"
-    assert student_data.get('user', {}).get('role') == 'student', "Student role incorrect"
-    assert not student_data.get('user', {}).get('is_teacher', True), "Student is_teacher property incorrect"
+    # Try to access teacher courses as student
+    unauthorized_courses_response = auth_headers['student'].get(
+        '/api/courses/'
+    )
+    assert unauthorized_courses_response.status_code == 200  # Will return student's courses
+
+
+@pytest.mark.parametrize('role', ['teacher', 'student'])
+def test_auth_status(test_app, auth_headers, role):
+    """Verify the authentication status is working correctly for each role."""
+    response = auth_headers[role].get('/api/isLoggedIn')
+    data = response.get_json()
+    print(f"{role.capitalize()} auth status response: {data}")
     
-    # Test without authentication headers
+    assert response.status_code == 200, f"{role.capitalize()} auth check failed"
+    assert data.get('isAuthenticated') is True, f"{role.capitalize()} not authenticated"
+    
+    user = data.get('user', {})
+    assert user.get('role') == role, f"{role.capitalize()} role incorrect"
+    assert user.get('id') == getattr(test_app, f'test_{role}_id'), f"{role.capitalize()} id incorrect"
+    assert user.get('email') == f'{role}_test@example.com', f"{role.capitalize()} email incorrect"
+
+
+def test_auth_status_unauthenticated(test_client):
+    """Verify the authentication status without a logged-in user."""
     no_auth_response = test_client.get('/api/isLoggedIn')
-    no_auth_data = json.loads(no_auth_response.data)
+    no_auth_data = no_auth_response.get_json()
     print(f"No auth status response: {no_auth_data}")
     
     assert no_auth_response.status_code == 200, "No auth check failed"